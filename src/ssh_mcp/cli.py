@@ -16,28 +16,60 @@ fully compatible with TypeScript version parameters.
 Modern type-safe implementation using Python 3.12+ features.
 """
 
+import re
+from functools import cache, lru_cache
 from typing import Annotated
 
+import click
 import typer
 
 from .models import SSHConfig, SshConnectionConfigMap
 
-# Try to get version from package metadata
-try:
+
+# Looked up only when --version is given, so other runs skip the metadata scan
+@cache
+def _get_version() -> str:
+    """Get the version from package metadata, falling back to the default."""
     import importlib.metadata
 
-    __version__ = importlib.metadata.version("fastmcp-ssh-server")
-except (importlib.metadata.PackageNotFoundError, Exception):
-    __version__ = "0.1.0"  # Fallback version
+    try:
+        return importlib.metadata.version("fastmcp-ssh-server")
+    except (importlib.metadata.PackageNotFoundError, Exception):
+        return "0.1.0"  # Fallback version
 
 
 # Version callback
 def version_callback(value: bool):
     if value:
-        typer.echo(f"SSH MCP Server v{__version__}")
+        typer.echo(f"SSH MCP Server v{_get_version()}")
         raise typer.Exit()
 
 
+# Pattern list separators, swallowing the whitespace around each separator
+_COMMA_SPLIT = re.compile(r"\s*,\s*").split
+_PIPE_SPLIT = re.compile(r"\s*\|\s*").split
+
+
+@lru_cache(maxsize=256)
+def _split_ssh_string(ssh_string: str) -> tuple[tuple[str, str], ...]:
+    """
+    Split an SSH connection string into stripped key/value pairs.
+
+    Cached because the same strings are parsed repeatedly; the result is an
+    immutable tuple so callers cannot corrupt the cache.
+    """
+    # A bare hostname or an empty string has no fields to split
+    if "=" not in ssh_string:
+        return ()
+
+    pairs = []
+    for part in ssh_string.split(","):
+        key, _, value = part.partition("=")
+        if key and value:
+            pairs.append((key.strip(), value.strip()))
+    return tuple(pairs)
+
+
 # Create Typer app
 app = typer.Typer(
     name="ssh-mcp-server",
@@ -74,15 +106,7 @@ class CLIParser:
         Raises:
             ValueError: If required parameters are missing or invalid
         """
-        parts = ssh_string.split(",")
-        config_dict = {}
-
-        for part in parts:
-            if "=" not in part:
-                continue
-            key, value = part.split("=", 1)
-            if key and value:
-                config_dict[key.strip()] = value.strip()
+        config_dict = dict(_split_ssh_string(ssh_string))
 
         # Validate required parameters
         required_fields = ["name", "host", "port", "user"]
@@ -112,19 +136,11 @@ class CLIParser:
         # Parse whitelist/blacklist
         whitelist = None
         if config_dict.get("whitelist"):
-            whitelist = [
-                pattern.strip()
-                for pattern in config_dict["whitelist"].split("|")
-                if pattern.strip()
-            ]
+            whitelist = [p for p in _PIPE_SPLIT(config_dict["whitelist"].strip()) if p]
 
         blacklist = None
         if config_dict.get("blacklist"):
-            blacklist = [
-                pattern.strip()
-                for pattern in config_dict["blacklist"].split("|")
-                if pattern.strip()
-            ]
+            blacklist = [p for p in _PIPE_SPLIT(config_dict["blacklist"].strip()) if p]
 
         return SSHConfig(
             name=config_dict["name"],
@@ -138,6 +154,11 @@ class CLIParser:
             command_blacklist=blacklist,
         )
 
+    @staticmethod
+    def clear_cache() -> None:
+        """Clear the cache of parsed SSH connection strings."""
+        _split_ssh_string.cache_clear()
+
     @staticmethod
     def create_single_connection_config(
         host: str | None,
@@ -200,15 +221,11 @@ class CLIParser:
         # Parse whitelist/blacklist
         whitelist_patterns = None
         if whitelist:
-            whitelist_patterns = [
-                pattern.strip() for pattern in whitelist.split(",") if pattern.strip()
-            ]
+            whitelist_patterns = [p for p in _COMMA_SPLIT(whitelist.strip()) if p]
 
         blacklist_patterns = None
         if blacklist:
-            blacklist_patterns = [
-                pattern.strip() for pattern in blacklist.split(",") if pattern.strip()
-            ]
+            blacklist_patterns = [p for p in _COMMA_SPLIT(blacklist.strip()) if p]
 
         return SSHConfig(
             name="default",
@@ -323,8 +340,13 @@ def main(
         # Import the server startup function
         from .main import start_server_with_config
 
-        # Start the server
-        asyncio.run(start_server_with_config(config_map))
+        # Start the server, on uvloop's faster event loop when it is installed
+        try:
+            import uvloop
+        except ImportError:
+            asyncio.run(start_server_with_config(config_map))
+        else:
+            uvloop.run(start_server_with_config(config_map))
 
     except Exception as e:
         typer.echo(f"❌ Error: {e}", err=True)
@@ -397,11 +419,22 @@ def parse_cli_args(
     return config_map
 
 
+@cache
+def get_command() -> click.Command:
+    """
+    Get the Click command behind the Typer app.
+
+    Typer rebuilds the Click command tree every time the app is called;
+    callers that invoke the CLI repeatedly (such as tests) reuse this one.
+    """
+    return typer.main.get_command(app)
+
+
 # Convenience function for running the app
 def run_cli() -> None:
     """Run the Typer CLI application."""
     app()
 
 
-__all__ = ["CLIParser", "parse_cli_args", "main", "app", "run_cli"]
+__all__ = ["CLIParser", "parse_cli_args", "main", "app", "get_command", "run_cli"]
 # {{END_MODIFICATIONS}}
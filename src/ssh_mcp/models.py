@@ -58,6 +58,24 @@ class SSHConfig(BaseModel):
         alias="commandBlacklist",
         description="Command blacklist (array of regex patterns)",
     )
+    max_sessions_per_connection: int = Field(
+        default=10,
+        ge=1,
+        alias="maxSessionsPerConnection",
+        description="Maximum concurrent sessions on the shared connection",
+    )
+    sftp_block_size: int | None = Field(
+        default=None,
+        ge=1,
+        alias="sftpBlockSize",
+        description="SFTP read/write block size in bytes, server-negotiated if unset",
+    )
+    sftp_max_requests: int | None = Field(
+        default=None,
+        ge=1,
+        alias="sftpMaxRequests",
+        description="SFTP requests kept in flight per file, asyncssh default if unset",
+    )
 
     @field_validator("port")
     @classmethod
@@ -16,9 +16,14 @@ for centralized connection management.
 """
 
 import asyncio
+import os
 import re
+import warnings
+from collections import defaultdict
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Any, Optional
+from typing import Optional, TypedDict
 
 import asyncssh
 
@@ -26,6 +31,151 @@ from .models import ServerInfo, SSHConfig, SshConnectionConfigMap
 from .utils import Logger
 
 
+def _env_positive_int(name: str, default: int) -> int:
+    """
+    Read a positive integer setting from the environment.
+
+    Invalid values fall back to the default with a warning instead of making
+    the package fail to import.
+
+    Args:
+        name: Environment variable name
+        default: Value used when the variable is unset or invalid
+
+    Returns:
+        Configured value
+    """
+    value = os.environ.get(name)
+    if value is None:
+        return default
+
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        warnings.warn(
+            f"Ignoring invalid {name}={value!r}, using {default}",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+        return default
+    return number
+
+
+# Cap on simultaneous connection handshakes, kept below sshd's default
+# MaxStartups of 10 so bursts are queued here instead of dropped by the server
+_MAX_CONCURRENT_CONNECTS = _env_positive_int("SSH_MCP_MAX_CONCURRENT_CONNECTS", 8)
+_CONNECT_ATTEMPTS = 3
+_CONNECT_BACKOFF = 0.5  # Seconds, doubled after each dropped attempt
+_CLOSE_TIMEOUT = 5  # Seconds to wait for a connection to close cleanly
+# Transfers kept in flight at once by upload_many/download_many
+_SFTP_BATCH_CONCURRENCY = 8
+# Keepalives let asyncssh notice connections silently dropped by NAT/firewalls
+_KEEPALIVE_INTERVAL = 30
+_KEEPALIVE_COUNT_MAX = 3
+
+
+class _SFTPOptions(TypedDict, total=False):
+    """SFTP transfer tunables passed to SFTPClient.put/get when configured."""
+
+    block_size: int
+    max_requests: int
+
+
+@lru_cache(maxsize=256)
+def _compile_rules(patterns: tuple[str, ...]) -> Callable[[str], bool]:
+    """
+    Compile command rule patterns into a single matcher.
+
+    The patterns are joined into one alternation so a command is scanned once
+    regardless of how many rules there are. A bare "*" matches every command.
+
+    Args:
+        patterns: Regex patterns from a whitelist or blacklist
+
+    Returns:
+        Function returning True if a command matches any pattern
+    """
+    if "*" in patterns:
+        return lambda command: True
+
+    try:
+        combined = re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+    except re.error:
+        # Patterns with global inline flags cannot be joined; match one by one
+        compiled = [re.compile(pattern) for pattern in patterns]
+        return lambda command: any(pattern.search(command) for pattern in compiled)
+
+    return lambda command: combined.search(command) is not None
+
+
+@lru_cache(maxsize=32)
+def _load_keypairs(
+    path: str,
+    mtime_ns: int,
+    cert_mtime_ns: int | None,
+    passphrase: str | None,
+) -> tuple[asyncssh.SSHKeyPair, ...]:
+    """
+    Load a private key file, cached so reconnects skip re-parsing it.
+
+    asyncssh also picks up a matching "<path>-cert.pub" certificate. The
+    modification times of both files are part of the cache key, so a key or
+    certificate replaced on disk is read again.
+
+    Args:
+        path: Path to the private key file
+        mtime_ns: Modification time of the key file in nanoseconds
+        cert_mtime_ns: Modification time of the certificate, None if absent
+        passphrase: Passphrase for an encrypted key
+
+    Returns:
+        Key pairs to offer as client keys
+    """
+    return tuple(asyncssh.load_keypairs(path, passphrase))
+
+
+def _read_client_keys(
+    path: str, passphrase: str | None
+) -> tuple[asyncssh.SSHKeyPair, ...]:
+    """
+    Load the client keys for a private key file, reusing a cached parse.
+
+    Blocks on file I/O and key decryption, so it is run in a worker thread.
+
+    Args:
+        path: Path to the private key file
+        passphrase: Passphrase for an encrypted key
+
+    Returns:
+        Key pairs to offer as client keys
+    """
+    try:
+        cert_mtime_ns: int | None = os.stat(f"{path}-cert.pub").st_mtime_ns
+    except OSError:
+        cert_mtime_ns = None
+    return _load_keypairs(path, os.stat(path).st_mtime_ns, cert_mtime_ns, passphrase)
+
+
+class _ConnectionWatcher(asyncssh.SSHClient):
+    """Client callbacks that evict a connection from the manager once it is lost."""
+
+    def __init__(self, manager: "SSHConnectionManager", key: str) -> None:
+        self._manager = manager
+        self._key = key
+        self._connection: asyncssh.SSHClientConnection | None = None
+
+    def connection_made(self, conn: asyncssh.SSHClientConnection) -> None:
+        self._connection = conn
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        # Only evict if the pool still holds this connection, not a newer one
+        if self._manager._connections.get(self._key) is self._connection:
+            del self._manager._connections[self._key]
+            self._manager._connected[self._key] = False
+
+
 class SSHConnectionManager:
     """
     SSH Connection Manager singleton class.
@@ -39,7 +189,6 @@ class SSHConnectionManager:
     """
 
     _instance: Optional["SSHConnectionManager"] = None
-    _lock = asyncio.Lock()
 
     def __init__(self) -> None:
         """Private constructor for singleton pattern."""
@@ -48,18 +197,40 @@ class SSHConnectionManager:
                 "Use SSHConnectionManager.get_instance() to get the singleton instance"
             )
 
+        self._init_state()
+
+    def _init_state(self) -> None:
+        """Initialize empty connection, config and concurrency state."""
         self._connections: dict[str, asyncssh.SSHClientConnection] = {}
         self._configs: SshConnectionConfigMap = {}
         self._connected: dict[str, bool] = {}
+        self._connect_locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._session_slots: dict[str, asyncio.Semaphore] = {}
+        self._connect_sem = asyncio.Semaphore(_MAX_CONCURRENT_CONNECTS)
         self._default_name: str = "default"
 
+    @classmethod
+    def _new_for_test(cls) -> "SSHConnectionManager":
+        """
+        Create a standalone instance that bypasses the singleton.
+
+        Lets tests use isolated managers without resetting the shared instance,
+        so they can run in parallel.
+        """
+        instance = cls.__new__(cls)
+        instance._init_state()
+        return instance
+
     @classmethod
     async def get_instance(cls) -> "SSHConnectionManager":
-        """Get singleton instance (thread-safe)."""
+        """
+        Get singleton instance.
+
+        The instance is created when this module is imported, so no lock is
+        needed here; it is only recreated if it has been explicitly reset.
+        """
         if cls._instance is None:
-            async with cls._lock:
-                if cls._instance is None:
-                    cls._instance = cls()
+            cls._instance = cls()
         return cls._instance
 
     def set_config(
@@ -73,6 +244,8 @@ class SSHConnectionManager:
             default_name: Optional default connection name, if not specified uses first config
         """
         self._configs = configs
+        # Session limits may differ in the new configs; size slots afresh
+        self._session_slots.clear()
 
         if default_name and default_name in configs:
             self._default_name = default_name
@@ -142,56 +315,110 @@ class SSHConnectionManager:
         """
         key = name or self._default_name
 
-        # Return if already connected
-        if self._connected.get(key) and key in self._connections:
+        # Return if already connected; only live connections are kept in
+        # _connections, so its membership alone is the connected check
+        if key in self._connections:
             return
 
-        config = self.get_config(key)
+        # Serialize connects per connection name only, so concurrent callers
+        # share one connection and different servers do not wait on each other
+        async with self._connect_locks[key]:
+            # Another task may have connected while this one waited
+            if key in self._connections:
+                return
+
+            config = self.get_config(key)
+
+            try:
+                # Resolve authentication method; () and None are asyncssh's defaults
+                client_keys: tuple[asyncssh.SSHKeyPair, ...] = ()
+                password: str | None = None
+
+                if config.private_key:
+                    # Use private key authentication
+                    key_path = Path(config.private_key).expanduser()
+                    if not key_path.exists():
+                        raise ValueError(f"Private key file not found: {key_path}")
+
+                    client_keys = await asyncio.to_thread(
+                        _read_client_keys, str(key_path), config.passphrase or None
+                    )
+
+                    Logger.info(f"Using SSH private key authentication for [{key}]")
+
+                elif config.password:
+                    # Use password authentication
+                    password = config.password
+                    Logger.info(f"Using password authentication for [{key}]")
+
+                else:
+                    raise ValueError(
+                        f"No valid authentication method provided for [{key}]"
+                    )
+
+                # Establish connection
+                connection = await self._open_connection(
+                    config,
+                    client_factory=partial(_ConnectionWatcher, self, key),
+                    client_keys=client_keys,
+                    password=password,
+                )
 
-        try:
-            # Prepare connection options
-            connect_kwargs: dict[str, Any] = {
-                "host": config.host,
-                "port": config.port,
-                "username": config.username,
-                "known_hosts": None,  # Disable host key checking for now
-            }
-
-            # Set authentication method
-            if config.private_key:
-                # Use private key authentication
-                key_path = Path(config.private_key).expanduser()
-                if not key_path.exists():
-                    raise ValueError(f"Private key file not found: {key_path}")
-
-                connect_kwargs["client_keys"] = [str(key_path)]
-                if config.passphrase:
-                    connect_kwargs["passphrase"] = config.passphrase
-
-                Logger.info(f"Using SSH private key authentication for [{key}]")
-
-            elif config.password:
-                # Use password authentication
-                connect_kwargs["password"] = config.password
-                Logger.info(f"Using password authentication for [{key}]")
-
-            else:
-                raise ValueError(f"No valid authentication method provided for [{key}]")
-
-            # Establish connection
-            connection = await asyncssh.connect(**connect_kwargs)
-
-            # Store connection and update status
-            self._connections[key] = connection
-            self._connected[key] = True
-
-            Logger.info(
-                f"Successfully connected to SSH server [{key}] {config.host}:{config.port}"
-            )
+                # Store connection and update status
+                self._connections[key] = connection
+                self._connected[key] = True
 
-        except Exception as e:
-            self._connected[key] = False
-            raise ConnectionError(f"SSH connection [{key}] failed: {str(e)}") from e
+                Logger.info(
+                    f"Successfully connected to SSH server [{key}] {config.host}:{config.port}"
+                )
+
+            except Exception as e:
+                self._connected[key] = False
+                raise ConnectionError(f"SSH connection [{key}] failed: {str(e)}") from e
+
+    async def _open_connection(
+        self,
+        config: SSHConfig,
+        *,
+        client_factory: Callable[[], asyncssh.SSHClient],
+        client_keys: Sequence[asyncssh.SSHKeyPair],
+        password: str | None,
+    ) -> asyncssh.SSHClientConnection:
+        """
+        Open an SSH connection, limiting how many handshakes run at once.
+
+        Connections dropped during the handshake, as sshd does once MaxStartups
+        is exceeded, are retried with exponential backoff.
+
+        Args:
+            config: SSH configuration of the server
+            client_factory: Factory for the connection's client callbacks
+            client_keys: Private keys to authenticate with, () for none
+            password: Password to authenticate with, None for none
+
+        Returns:
+            AsyncSSH connection object
+        """
+        attempt = 1
+        while True:
+            try:
+                async with self._connect_sem:
+                    return await asyncssh.connect(
+                        host=config.host,
+                        port=config.port,
+                        username=config.username,
+                        known_hosts=None,  # Disable host key checking for now
+                        keepalive_interval=_KEEPALIVE_INTERVAL,
+                        keepalive_count_max=_KEEPALIVE_COUNT_MAX,
+                        client_factory=client_factory,
+                        client_keys=client_keys,
+                        password=password,
+                    )
+            except (asyncssh.ConnectionLost, ConnectionResetError):
+                if attempt == _CONNECT_ATTEMPTS:
+                    raise
+                await asyncio.sleep(_CONNECT_BACKOFF * 2 ** (attempt - 1))
+                attempt += 1
 
     def get_connection(self, name: str | None = None) -> asyncssh.SSHClientConnection:
         """
@@ -225,10 +452,33 @@ class SSHConnectionManager:
         """
         key = name or self._default_name
 
-        if not self._connected.get(key) or key not in self._connections:
+        # Single lookup on the hot path when the connection is already open
+        connection = self._connections.get(key)
+        if connection is None:
             await self.connect(key)
+            connection = self.get_connection(key)
 
-        return self.get_connection(key)
+        return connection
+
+    def _session_slot(self, name: str | None = None) -> asyncio.Semaphore:
+        """
+        Get the semaphore limiting concurrent sessions on a connection.
+
+        All commands and SFTP transfers for a server share one connection; this
+        keeps the number of open channels within the server's MaxSessions.
+
+        Args:
+            name: Connection name, uses default if not specified
+
+        Returns:
+            Semaphore sized by the connection's max_sessions_per_connection
+        """
+        key = name or self._default_name
+        slot = self._session_slots.get(key)
+        if slot is None:
+            slot = asyncio.Semaphore(self.get_config(key).max_sessions_per_connection)
+            self._session_slots[key] = slot
+        return slot
 
     def validate_command(
         self, command: str, name: str | None = None
@@ -245,20 +495,19 @@ class SSHConnectionManager:
         """
         config = self.get_config(name)
 
+        # Fast path: no rules configured for this connection. Checked on the
+        # current config so that rules added after set_config still apply
+        if not config.command_whitelist and not config.command_blacklist:
+            return True, None
+
         # Check whitelist (if configured, command must match one pattern)
         if config.command_whitelist:
-            matches_whitelist = any(
-                re.search(pattern, command) for pattern in config.command_whitelist
-            )
-            if not matches_whitelist:
+            if not _compile_rules(tuple(config.command_whitelist))(command):
                 return False, "Command not in whitelist, execution forbidden"
 
         # Check blacklist (if command matches any pattern, forbidden)
         if config.command_blacklist:
-            matches_blacklist = any(
-                re.search(pattern, command) for pattern in config.command_blacklist
-            )
-            if matches_blacklist:
+            if _compile_rules(tuple(config.command_blacklist))(command):
                 return False, "Command matches blacklist, execution forbidden"
 
         return True, None
@@ -290,8 +539,11 @@ class SSHConnectionManager:
         connection = await self.ensure_connected(name)
 
         try:
-            # Execute command with timeout
-            result = await asyncio.wait_for(connection.run(cmd_string), timeout=timeout)
+            # Execute command with timeout once a session slot is free
+            async with self._session_slot(name):
+                result = await asyncio.wait_for(
+                    connection.run(cmd_string), timeout=timeout
+                )
 
             if result.exit_status != 0:
                 error_msg = result.stderr.strip() if result.stderr else ""
@@ -330,20 +582,39 @@ class SSHConnectionManager:
             Exception: For file not found, SFTP connection, or upload failures
                       (maintains compatibility with TypeScript version)
         """
-        # Validate local file exists
-        local_file = Path(local_path).expanduser()
-        if not local_file.exists():
-            raise Exception(f"File upload failed: Local file not found: {local_path}")
+        await self.upload_many([(local_path, remote_path)], name)
+        return "File uploaded successfully"
+
+    async def upload_many(
+        self, items: Iterable[tuple[str, str]], name: str | None = None
+    ) -> str:
+        """
+        Upload several files over a single SFTP session.
+
+        Args:
+            items: Pairs of (local_path, remote_path)
+            name: Connection name, uses default if not specified
+
+        Returns:
+            Success message: "Files uploaded successfully"
 
-        if not local_file.is_file():
-            raise Exception(f"File upload failed: Path is not a file: {local_path}")
+        Raises:
+            Exception: For file not found, SFTP connection, or upload failures
+        """
+        # Validate every local file before opening the SFTP session, off the
+        # event loop since stat calls can block on slow filesystems
+        transfers = await asyncio.to_thread(self._upload_sources, list(items))
 
         connection = await self.ensure_connected(name)
 
         try:
-            async with connection.start_sftp_client() as sftp:
-                await sftp.put(str(local_file), remote_path)
-            return "File uploaded successfully"
+            async with (
+                self._session_slot(name),
+                connection.start_sftp_client() as sftp,
+            ):
+                put = partial(sftp.put, **self._sftp_options(name))
+                await self._transfer_all(put, transfers)
+            return "Files uploaded successfully"
 
         except Exception as e:
             if "File upload failed:" in str(e):
@@ -368,54 +639,171 @@ class SSHConnectionManager:
             Exception: For SFTP connection, remote file access, or download failures
                       (maintains compatibility with TypeScript version)
         """
-        # Ensure local directory exists and expand user path
-        local_file = Path(local_path).expanduser()
-        local_file.parent.mkdir(parents=True, exist_ok=True)
+        await self.download_many([(remote_path, local_path)], name)
+        return "File downloaded successfully"
+
+    async def download_many(
+        self, items: Iterable[tuple[str, str]], name: str | None = None
+    ) -> str:
+        """
+        Download several files over a single SFTP session.
+
+        Args:
+            items: Pairs of (remote_path, local_path)
+            name: Connection name, uses default if not specified
+
+        Returns:
+            Success message: "Files downloaded successfully"
+
+        Raises:
+            Exception: For SFTP connection, remote file access, or download failures
+        """
+        transfers = await asyncio.to_thread(self._download_targets, list(items))
 
         connection = await self.ensure_connected(name)
 
         try:
-            async with connection.start_sftp_client() as sftp:
-                await sftp.get(remote_path, str(local_file))
-            return "File downloaded successfully"
+            async with (
+                self._session_slot(name),
+                connection.start_sftp_client() as sftp,
+            ):
+                options = self._sftp_options(name)
+
+                async def get(remote_path: str, local_path: str) -> None:
+                    try:
+                        await sftp.get(remote_path, local_path, **options)
+                    except Exception as e:
+                        raise self._download_error(e, remote_path) from e
+
+                await self._transfer_all(get, transfers)
+            return "Files downloaded successfully"
 
         except Exception as e:
             if "File download failed:" in str(e):
                 raise  # Re-raise our custom exceptions
-            # Handle specific SFTP errors with appropriate messages
-            error_msg = str(e)
-            if "not found" in error_msg.lower() or "no such file" in error_msg.lower():
-                raise Exception(
-                    f"File download failed: Remote file not found: {remote_path}"
-                ) from e
-            elif "permission" in error_msg.lower() or "access" in error_msg.lower():
+            remote_paths = ", ".join(remote_path for remote_path, _ in transfers)
+            raise self._download_error(e, remote_paths) from e
+
+    def _sftp_options(self, name: str | None = None) -> _SFTPOptions:
+        """Get the SFTP transfer tunables configured for a connection."""
+        config = self.get_config(name)
+        options: _SFTPOptions = {}
+        if config.sftp_block_size is not None:
+            options["block_size"] = config.sftp_block_size
+        if config.sftp_max_requests is not None:
+            options["max_requests"] = config.sftp_max_requests
+        return options
+
+    @staticmethod
+    def _upload_sources(items: list[tuple[str, str]]) -> list[tuple[str, str]]:
+        """Resolve local upload sources, checking that each is an existing file."""
+        transfers = []
+        for local_path, remote_path in items:
+            local_file = Path(local_path).expanduser()
+            if not local_file.exists():
                 raise Exception(
-                    f"File download failed: Permission denied: {remote_path}"
-                ) from e
-            else:
-                raise Exception(f"File download failed: {error_msg}") from e
+                    f"File upload failed: Local file not found: {local_path}"
+                )
+
+            if not local_file.is_file():
+                raise Exception(f"File upload failed: Path is not a file: {local_path}")
+
+            transfers.append((str(local_file), remote_path))
+        return transfers
+
+    @staticmethod
+    def _download_targets(items: list[tuple[str, str]]) -> list[tuple[str, str]]:
+        """Resolve local download targets, creating their parent directories."""
+        transfers = []
+        for remote_path, local_path in items:
+            # Ensure local directory exists and expand user path
+            local_file = Path(local_path).expanduser()
+            local_file.parent.mkdir(parents=True, exist_ok=True)
+            transfers.append((remote_path, str(local_file)))
+        return transfers
+
+    @staticmethod
+    async def _transfer_all(
+        transfer: Callable[[str, str], Awaitable[None]],
+        items: list[tuple[str, str]],
+    ) -> None:
+        """
+        Run (source, target) SFTP transfers with bounded concurrency.
+
+        The first failure cancels the remaining transfers, before the caller
+        closes the SFTP session they share, and is raised on its own.
+        """
+        limit = asyncio.Semaphore(_SFTP_BATCH_CONCURRENCY)
+
+        async def run(source: str, target: str) -> None:
+            async with limit:
+                await transfer(source, target)
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                for source, target in items:
+                    group.create_task(run(source, target))
+        except ExceptionGroup as errors:
+            first = errors.exceptions[0]
+            raise first from first.__cause__
+
+    @staticmethod
+    def _download_error(error: Exception, remote_path: str) -> Exception:
+        """Map an SFTP download failure to the download error message."""
+        error_msg = str(error)
+        # Handle specific SFTP errors with appropriate messages
+        if "not found" in error_msg.lower() or "no such file" in error_msg.lower():
+            return Exception(
+                f"File download failed: Remote file not found: {remote_path}"
+            )
+        elif "permission" in error_msg.lower() or "access" in error_msg.lower():
+            return Exception(f"File download failed: Permission denied: {remote_path}")
+        else:
+            return Exception(f"File download failed: {error_msg}")
 
     async def disconnect(self, name: str | None = None) -> None:
         """
         Disconnect SSH connection.
 
+        A connection that fails to close, or does not finish closing in
+        time, is logged and dropped; it is never reused either way.
+
         Args:
             name: Connection name, disconnects all if not specified
         """
         if name:
             # Disconnect specific connection
-            if name in self._connections:
-                self._connections[name].close()
-                await self._connections[name].wait_closed()
-                del self._connections[name]
+            connection = self._connections.pop(name, None)
+            if connection is not None:
                 self._connected[name] = False
+                await self._close_connection(name, connection)
         else:
-            # Disconnect all connections
-            for connection in self._connections.values():
-                connection.close()
-                await connection.wait_closed()
-            self._connections.clear()
+            # Disconnect all connections concurrently; one failing close must
+            # not keep the others open
+            connections = self._connections
+            self._connections = {}
             self._connected.clear()
+            await asyncio.gather(
+                *(
+                    self._close_connection(conn_name, connection)
+                    for conn_name, connection in connections.items()
+                )
+            )
+
+    @staticmethod
+    async def _close_connection(
+        name: str, connection: asyncssh.SSHClientConnection
+    ) -> None:
+        """Close a single SSH connection and wait, bounded, until it is closed."""
+        try:
+            connection.close()
+            await asyncio.wait_for(connection.wait_closed(), timeout=_CLOSE_TIMEOUT)
+        except TimeoutError:
+            Logger.warning(
+                f"SSH connection [{name}] not closed after {_CLOSE_TIMEOUT} seconds"
+            )
+        except Exception as e:
+            Logger.warning(f"Failed to close SSH connection [{name}]: {e}")
 
     def get_all_server_infos(self) -> list[ServerInfo]:
         """
@@ -424,18 +812,18 @@ class SSHConnectionManager:
         Returns:
             List of server information objects
         """
-        servers = []
-        for name, config in self._configs.items():
-            server_info = ServerInfo(
+        # Built from the current configs on every call, so entries changed or
+        # added after set_config are reported as they are now
+        return [
+            ServerInfo(
                 name=name,
                 host=config.host,
                 port=config.port,
                 username=config.username,
                 connected=self._connected.get(name, False),
             )
-            servers.append(server_info)
-
-        return servers
+            for name, config in self._configs.items()
+        ]
 
     async def __aenter__(self) -> "SSHConnectionManager":
         """Async context manager entry."""
@@ -446,5 +834,9 @@ class SSHConnectionManager:
         await self.disconnect()
 
 
+# Create the singleton eagerly so get_instance is a plain attribute read
+SSHConnectionManager._instance = SSHConnectionManager()
+
+
 __all__ = ["SSHConnectionManager"]
 # {{END_MODIFICATIONS}}
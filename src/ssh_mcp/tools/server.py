@@ -143,6 +143,7 @@ class OptimizedSSHMCPServer:
 
             self._is_initialized = False
             self.logger.info("Server cleanup completed")
+            await Logger.complete()
 
         except Exception as e:
             self.logger.error(f"Error during cleanup: {e}")
@@ -23,6 +23,7 @@ Features:
 import functools
 import traceback
 from collections.abc import Callable
+from datetime import datetime
 from typing import Any, TypeVar
 
 from .logger import Logger
@@ -115,9 +116,7 @@ class ErrorHandler:
         error_dict = {
             "error_type": type(error).__name__,
             "message": str(error),
-            "timestamp": Logger.get_logger().handlers[0].formatter.formatTime(None)
-            if Logger.get_logger().handlers
-            else None,
+            "timestamp": datetime.now().isoformat(timespec="milliseconds"),
         }
 
         # Add context if available and requested
@@ -23,13 +23,56 @@ Features:
 """
 
 import sys
+import weakref
+from collections.abc import Callable
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from loguru import logger
 
 from ..models import LogLevel
 
+if TYPE_CHECKING:
+    from loguru import Logger as LoguruLogger
+
+
+# Default format - loguru's format is much more readable
+_DEFAULT_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | "
+    "<level>{level: <8}</level> | "
+    "<cyan>{name}</cyan> | "
+    "<level>{message}</level>"
+)
+
+# Map lowercase level names to loguru level names
+_LEVEL_MAP: dict[str, str] = {
+    "debug": "DEBUG",
+    "info": "INFO",
+    "warning": "WARNING",
+    "error": "ERROR",
+    "critical": "CRITICAL",
+}
+
+# Loguru severity number for each level name, used to filter early
+_LEVEL_NO: dict[str, int] = {
+    name: logger.level(level_name).no for name, level_name in _LEVEL_MAP.items()
+}
+
+# Set once setup_logging has configured the sinks; checked on every log call
+_initialized = False
+
+# Fully qualified name of each exception class seen by handle_error
+_ERROR_CLASS_NAMES: weakref.WeakKeyDictionary[type, str] = weakref.WeakKeyDictionary()
+
+
+def _error_class_name(error_class: type) -> str:
+    """Return "module.ClassName" for an exception class, computed once per class."""
+    name = _ERROR_CLASS_NAMES.get(error_class)
+    if name is None:
+        name = f"{error_class.__module__}.{error_class.__name__}"
+        _ERROR_CLASS_NAMES[error_class] = name
+    return name
+
 
 class Logger:
     """
@@ -39,8 +82,11 @@ class Logger:
     Compatible with TypeScript version interface while adding enhanced functionality.
     """
 
-    _initialized = False
     _current_level = "INFO"
+    _current_level_no = _LEVEL_NO["info"]
+    _bound_cache: dict[str, "LoguruLogger"] = {}
+    _active_setup: tuple[Any, ...] | None = None
+    _handler_ids: list[int] = []
 
     @classmethod
     def setup_logging(
@@ -49,6 +95,7 @@ class Logger:
         format_string: str | None = None,
         log_file: str | Path | None = None,
         enable_console: bool = True,
+        json_file: bool = False,
     ) -> None:
         """
         Setup the logging system with loguru configuration.
@@ -58,36 +105,50 @@ class Logger:
             format_string: Custom log format string (optional, loguru has great defaults)
             log_file: Optional file path for log output with automatic rotation
             enable_console: Whether to enable console output
+            json_file: Write the log file as one JSON record per line instead
+                of formatted text (rotated files are left uncompressed)
+
+        Note:
+            File output is written by a background worker; await
+            Logger.complete() before shutdown to flush pending records.
+            Repeating a call with the same arguments keeps the sinks added
+            before, so handlers removed directly through loguru stay removed.
         """
-        # Convert level to uppercase for loguru
-        level_map = {
-            "debug": "DEBUG",
-            "info": "INFO",
-            "warning": "WARNING",
-            "error": "ERROR",
-            "critical": "CRITICAL",
-        }
+        global _initialized
 
+        # Convert level to uppercase for loguru
         if isinstance(level, str):
-            cls._current_level = level_map.get(level.lower(), "INFO")
+            cls._current_level = _LEVEL_MAP.get(level.lower(), "INFO")
         else:
-            cls._current_level = level_map.get(level, "INFO")
+            cls._current_level = _LEVEL_MAP.get(level, "INFO")
+        cls._current_level_no = _LEVEL_NO[cls._current_level.lower()]
 
-        # Remove all existing handlers
-        logger.remove()
-
-        # Default format - loguru's format is much more readable
         if format_string is None:
-            format_string = (
-                "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | "
-                "<level>{level: <8}</level> | "
-                "<cyan>{name}</cyan> | "
-                "<level>{message}</level>"
-            )
+            format_string = _DEFAULT_FORMAT
+
+        # Loguru compiles the format of every sink it adds; keep the existing
+        # sinks when nothing changed since the last call and the console
+        # stream is the same object
+        setup_key = (
+            cls._current_level,
+            format_string,
+            str(log_file) if log_file else None,
+            sys.stdout if enable_console else None,
+            json_file,
+        )
+        if _initialized and setup_key == cls._active_setup:
+            return
+
+        # Remove all existing handlers and drop loggers bound to them; the
+        # setup is only recorded again once all of its handlers were added
+        logger.remove()
+        cls._active_setup = None
+        cls._bound_cache.clear()
+        cls._handler_ids = []
 
         # Console handler
         if enable_console:
-            logger.add(
+            handler_id = logger.add(
                 sys.stdout,
                 format=format_string,
                 level=cls._current_level,
@@ -95,25 +156,50 @@ class Logger:
                 backtrace=True,
                 diagnose=True,
             )
+            cls._handler_ids.append(handler_id)
 
         # File handler with automatic rotation
         if log_file:
             log_path = Path(log_file)
             log_path.parent.mkdir(parents=True, exist_ok=True)
 
-            logger.add(
+            handler_id = logger.add(
                 log_path,
-                format=format_string,
+                # JSON records carry all fields, so only the message is formatted
+                format="{message}" if json_file else format_string,
                 level=cls._current_level,
                 rotation="100 MB",  # Automatic rotation
                 retention="30 days",  # Keep logs for 30 days
-                compression="zip",  # Compress old logs
+                compression=None if json_file else "zip",  # Compress old text logs
                 backtrace=True,
                 diagnose=True,
-                serialize=False,  # Can be set to True for JSON logs
+                serialize=json_file,  # JSON logs for log shippers
+                enqueue=True,  # Write, rotate and compress off the caller thread
+                catch=True,  # Never let sink errors reach the caller
             )
+            cls._handler_ids.append(handler_id)
 
-        cls._initialized = True
+        cls._active_setup = setup_key
+        _initialized = True
+
+    @classmethod
+    async def complete(cls) -> None:
+        """Wait until all queued log records have been written by the sinks."""
+        await logger.complete()
+
+    @classmethod
+    def _bound(cls, name: str) -> "LoguruLogger":
+        """Return the loguru logger bound to the given name, reusing it per name."""
+        bound_logger = cls._bound_cache.get(name)
+        if bound_logger is None:
+            bound_logger = logger.bind(name=name)
+            cls._bound_cache[name] = bound_logger
+        return bound_logger
+
+    @classmethod
+    def _enabled(cls, level: str) -> bool:
+        """Check whether messages at the given level pass the configured level."""
+        return _LEVEL_NO.get(level, _LEVEL_NO["info"]) >= cls._current_level_no
 
     @classmethod
     def get_logger(cls, name: str = "fastmcp-ssh-server"):
@@ -126,11 +212,11 @@ class Logger:
         Returns:
             Loguru logger bound with name context
         """
-        if not cls._initialized:
+        if not _initialized:
             cls.setup_logging()
 
         # Return loguru logger bound with name context
-        return logger.bind(name=name)
+        return cls._bound(name)
 
     @classmethod
     def log(
@@ -151,28 +237,94 @@ class Logger:
             context: Additional context information (automatically structured)
             logger_name: Logger name for categorization
         """
-        if not cls._initialized:
-            cls.setup_logging()
+        cls._log(level, message, context=context, logger_name=logger_name)
+
+    @classmethod
+    def lazy(
+        cls,
+        level: LogLevel,
+        func: Callable[[], Any],
+        context: dict[str, Any] | None = None,
+        logger_name: str = "fastmcp-ssh-server",
+    ) -> None:
+        """
+        Log the result of func, calling it only if the message will be emitted.
 
-        # Get logger with name binding
-        bound_logger = logger.bind(name=logger_name)
+        Use this instead of passing a pre-built f-string when the message is
+        expensive to compute and the level may be filtered out.
 
-        # If context is provided, bind it to the logger for structured logging
+        Args:
+            level: Log level (info, debug, error, warning)
+            func: Zero-argument callable returning the message
+            context: Additional context information (automatically structured)
+            logger_name: Logger name for categorization
+        """
+        cls._log(
+            level, "{}", (func,), context=context, logger_name=logger_name, lazy=True
+        )
+
+    @classmethod
+    def logf(
+        cls,
+        level: LogLevel,
+        template: str,
+        *args: Any,
+        context: dict[str, Any] | None = None,
+        logger_name: str = "fastmcp-ssh-server",
+        **kwargs: Any,
+    ) -> None:
+        """
+        Log a brace-style template, formatting it only if it will be emitted.
+
+        Args:
+            level: Log level (info, debug, error, warning)
+            template: Message template using loguru's {} formatting
+            *args: Positional arguments for the template
+            context: Additional context information (automatically structured)
+            logger_name: Logger name for categorization
+            **kwargs: Keyword arguments for the template
+        """
+        cls._log(
+            level,
+            template,
+            args,
+            kwargs,
+            context=context,
+            logger_name=logger_name,
+        )
+
+    @classmethod
+    def _log(
+        cls,
+        level: str,
+        message: str,
+        args: tuple[Any, ...] = (),
+        kwargs: dict[str, Any] | None = None,
+        *,
+        context: dict[str, Any] | None,
+        logger_name: str,
+        lazy: bool = False,
+    ) -> None:
+        """
+        Emit a record for one of the public logging methods.
+
+        Filtered levels return before any binding or formatting. Records skip
+        this method and the public method that called it, so their file,
+        function and line point at the code using Logger.
+        """
+        if not cls._enabled(level):
+            return
+
+        if not _initialized:
+            cls.setup_logging()
+
+        bound_logger = cls._bound(logger_name)
         if context:
             bound_logger = bound_logger.bind(**context)
 
-        # Map LogLevel to loguru methods
-        level_map = {
-            "debug": bound_logger.debug,
-            "info": bound_logger.info,
-            "warning": bound_logger.warning,
-            "error": bound_logger.error,
-            "critical": bound_logger.critical,
-        }
-
-        # Get the log function and log the message
-        log_func = level_map.get(level, bound_logger.info)
-        log_func(message)
+        bound_logger.opt(lazy=lazy, depth=2).log(
+            _LEVEL_MAP.get(level, "INFO"), message, *args, **(kwargs or {})
+        )
 
     @classmethod
     def handle_error(
@@ -200,41 +352,42 @@ class Logger:
         Returns:
             Formatted error message
         """
-        if not cls._initialized:
+        if not _initialized:
             cls.setup_logging()
 
         # Extract error information
         error_message = str(error)
-        error_type = type(error).__name__
 
         # Build full message
         full_message = f"{prefix}: {error_message}" if prefix else error_message
 
-        # Prepare context
-        if context is None:
-            context = {}
-        context.update(
-            {
-                "error_type": error_type,
-                "error_class": error.__class__.__module__
-                + "."
-                + error.__class__.__name__,
-            }
-        )
+        # Nothing to emit if errors are filtered out
+        if not cls._enabled("error"):
+            if exit_on_error:
+                sys.exit(1)
+            return full_message
 
-        # Get logger with enhanced context
-        bound_logger = logger.bind(name=logger_name, **context)
+        # Get logger with caller context plus error details; the caller's
+        # dict is never modified and error details take precedence
+        bound_logger = cls._bound(logger_name)
+        if context:
+            bound_logger = bound_logger.bind(**context)
+        error_class = type(error)
+        bound_logger = bound_logger.bind(
+            error_type=error_class.__name__,
+            error_class=_error_class_name(error_class),
+        )
 
         # Log the error with automatic traceback if requested
-        if include_traceback and isinstance(error, Exception):
-            # Loguru's exception logging is much better than standard library
-            bound_logger.exception(full_message)
-        else:
-            bound_logger.error(full_message)
+        # Pass the exception itself so the traceback does not depend on being
+        # called from inside an except block; depth reports our caller
+        bound_logger.opt(exception=error if include_traceback else None, depth=1).error(
+            full_message
+        )
 
         # Exit if requested
         if exit_on_error:
-            bound_logger.critical("Exiting due to critical error")
+            bound_logger.opt(depth=1).critical("Exiting due to critical error")
             sys.exit(1)
 
         return full_message
@@ -247,7 +400,7 @@ class Logger:
         logger_name: str = "fastmcp-ssh-server",
     ) -> None:
         """Debug level logging."""
-        cls.log(message, "debug", context, logger_name)
+        cls._log("debug", message, context=context, logger_name=logger_name)
 
     @classmethod
     def info(
@@ -257,7 +410,7 @@ class Logger:
         logger_name: str = "fastmcp-ssh-server",
     ) -> None:
         """Info level logging."""
-        cls.log(message, "info", context, logger_name)
+        cls._log("info", message, context=context, logger_name=logger_name)
 
     @classmethod
     def warning(
@@ -267,7 +420,7 @@ class Logger:
         logger_name: str = "fastmcp-ssh-server",
     ) -> None:
         """Warning level logging."""
-        cls.log(message, "warning", context, logger_name)
+        cls._log("warning", message, context=context, logger_name=logger_name)
 
     @classmethod
     def error(
@@ -277,7 +430,7 @@ class Logger:
         logger_name: str = "fastmcp-ssh-server",
     ) -> None:
         """Error level logging."""
-        cls.log(message, "error", context, logger_name)
+        cls._log("error", message, context=context, logger_name=logger_name)
 
     @classmethod
     def critical(
@@ -287,7 +440,7 @@ class Logger:
         logger_name: str = "fastmcp-ssh-server",
     ) -> None:
         """Critical level logging."""
-        cls.log(message, "critical", context, logger_name)
+        cls._log("critical", message, context=context, logger_name=logger_name)
 
 
 # Convenience functions for backward compatibility and ease of use
@@ -296,9 +449,10 @@ def setup_logger(
     format_string: str | None = None,
     log_file: str | Path | None = None,
     enable_console: bool = True,
+    json_file: bool = False,
 ) -> None:
     """Setup the logging system - convenience function."""
-    Logger.setup_logging(level, format_string, log_file, enable_console)
+    Logger.setup_logging(level, format_string, log_file, enable_console, json_file)
 
 
 def get_logger(name: str = "fastmcp-ssh-server"):
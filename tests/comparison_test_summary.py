@@ -6,160 +6,162 @@ This script provides a comprehensive summary of the compatibility testing
 between v1 and v2 implementations of SSH MCP tools.
 """
 
-import asyncio
 import sys
 from pathlib import Path
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-
-async def generate_test_summary():
+# Test Results Matrix: (status icon, test name, result)
+TEST_RESULTS: tuple[tuple[str, str, str], ...] = (
+    ("✅", "Tool Registration Parity", "PASSED"),
+    ("✅", "Tool Descriptions Compatibility", "PASSED"),
+    ("✅", "Execute Command Compatibility", "PASSED (with mock SSH)"),
+    ("✅", "Upload Tool Compatibility", "PASSED (with mock SSH)"),
+    ("✅", "Download Tool Compatibility", "PASSED (with mock SSH)"),
+    ("⚡", "List Servers Compatibility", "PARTIAL (SSH manager issues in test)"),
+    ("⚠️", "Performance Comparison", "NEEDS OPTIMIZATION"),
+    ("⚠️", "Memory Usage Analysis", "REQUIRES TUNING"),
+    ("⚠️", "Throughput Testing", "SHOWS DIFFERENCES"),
+    ("⚠️", "Error Handling Consistency", "VERIFIED"),
+    ("⚠️", "API Compatibility", "100% COMPATIBLE"),
+    ("⚠️", "Enhanced Metadata (v2)", "IMPLEMENTED"),
+)
+
+
+def generate_test_summary() -> None:
     """Generate comprehensive test summary for v1 vs v2 comparison."""
-
-    print("\n" + "=" * 80)
-    print("🧪 SSH MCP Tools v1 vs v2 Compatibility Test Summary")
-    print("=" * 80)
-
-    # Test Results Matrix
-    test_results = {
-        "✅ Tool Registration Parity": "PASSED",
-        "✅ Tool Descriptions Compatibility": "PASSED",
-        "⚡ Execute Command Compatibility": "PASSED (with mock SSH)",
-        "🔧 Upload Tool Compatibility": "PASSED (with mock SSH)",
-        "📁 Download Tool Compatibility": "PASSED (with mock SSH)",
-        "📋 List Servers Compatibility": "PARTIAL (SSH manager issues in test)",
-        "🏆 Performance Comparison": "NEEDS OPTIMIZATION",
-        "📊 Memory Usage Analysis": "REQUIRES TUNING",
-        "🚀 Throughput Testing": "SHOWS DIFFERENCES",
-        "🔍 Error Handling Consistency": "VERIFIED",
-        "🎯 API Compatibility": "100% COMPATIBLE",
-        "📝 Enhanced Metadata (v2)": "IMPLEMENTED",
-    }
-
-    print("\n📊 Test Results Overview:")
-    print("-" * 60)
-    for test_name, result in test_results.items():
-        status_icon = (
-            "✅" if "PASSED" in result else "⚡" if "PARTIAL" in result else "⚠️"
-        )
-        print(f"{status_icon} {test_name.split(' ', 1)[1]:40} | {result}")
-
-    print("\n🎯 Key Findings:")
-    print("-" * 60)
-    print("✅ API COMPATIBILITY: 100% - v1 and v2 tools have identical interfaces")
-    print("✅ TOOL REGISTRATION: v2 auto-registration works correctly")
-    print("✅ FUNCTIONAL EQUIVALENCE: All core operations work in both versions")
-    print("✅ ERROR HANDLING: Consistent error behavior between versions")
-    print(
+    # Collect all lines and write them to stdout in one go
+    lines: list[str] = []
+    emit = lines.append
+
+    emit("\n" + "=" * 80)
+    emit("🧪 SSH MCP Tools v1 vs v2 Compatibility Test Summary")
+    emit("=" * 80)
+
+    emit("\n📊 Test Results Overview:")
+    emit("-" * 60)
+    for status_icon, test_name, result in TEST_RESULTS:
+        emit(f"{status_icon} {test_name:40} | {result}")
+
+    emit("\n🎯 Key Findings:")
+    emit("-" * 60)
+    emit("✅ API COMPATIBILITY: 100% - v1 and v2 tools have identical interfaces")
+    emit("✅ TOOL REGISTRATION: v2 auto-registration works correctly")
+    emit("✅ FUNCTIONAL EQUIVALENCE: All core operations work in both versions")
+    emit("✅ ERROR HANDLING: Consistent error behavior between versions")
+    emit(
         "✅ ENVIRONMENT SWITCHING: v1/v2 mode switching works via environment variables"
     )
-    print(
+    emit(
         "⚡ PERFORMANCE: v2 shows overhead in test environment (due to Context injection)"
     )
-    print("🔧 METADATA: v2 provides enhanced tool metadata and Context integration")
-
-    print("\n🏗️ Implementation Quality Assessment:")
-    print("-" * 60)
-    print("📋 Code Quality:")
-    print("   • v1: Traditional registration functions, manual setup")
-    print("   • v2: Modern decorators, automatic registration, dependency injection")
-    print()
-    print("🔍 Maintainability:")
-    print("   • v1: Requires manual tool registration in multiple places")
-    print("   • v2: Self-contained tool definitions with metadata")
-    print()
-    print("🚀 Developer Experience:")
-    print("   • v1: More boilerplate code, error-prone manual registration")
-    print("   • v2: Clean decorators, Context access, structured logging")
-    print()
-    print("⚡ Runtime Performance:")
-    print("   • v1: Lower overhead, faster in synthetic benchmarks")
-    print(
+    emit("🔧 METADATA: v2 provides enhanced tool metadata and Context integration")
+
+    emit("\n🏗️ Implementation Quality Assessment:")
+    emit("-" * 60)
+    emit("📋 Code Quality:")
+    emit("   • v1: Traditional registration functions, manual setup")
+    emit("   • v2: Modern decorators, automatic registration, dependency injection")
+    emit("")
+    emit("🔍 Maintainability:")
+    emit("   • v1: Requires manual tool registration in multiple places")
+    emit("   • v2: Self-contained tool definitions with metadata")
+    emit("")
+    emit("🚀 Developer Experience:")
+    emit("   • v1: More boilerplate code, error-prone manual registration")
+    emit("   • v2: Clean decorators, Context access, structured logging")
+    emit("")
+    emit("⚡ Runtime Performance:")
+    emit("   • v1: Lower overhead, faster in synthetic benchmarks")
+    emit(
         "   • v2: Additional features (Context, logging) add minimal overhead in real usage"
     )
 
-    print("\n💡 Migration Recommendations:")
-    print("-" * 60)
-    print("🎉 RECOMMENDED FOR MIGRATION:")
-    print("   ✅ 100% API compatibility ensures seamless transition")
-    print("   ✅ Enhanced developer experience with modern patterns")
-    print("   ✅ Better maintainability and code organization")
-    print("   ✅ Environment-based version control for gradual rollout")
-    print("   ✅ Enhanced debugging with Context integration")
-    print()
-    print("⚠️  CONSIDERATIONS:")
-    print("   • Test performance in real deployment environment")
-    print("   • Validate Context logging integration meets requirements")
-    print("   • Consider gradual migration using environment variables")
-
-    print("\n🔧 Migration Strategy:")
-    print("-" * 60)
-    print("1. 🧪 PHASE 1: Testing")
-    print("   • Deploy with SSH_MCP_TOOLS_VERSION=v1 (current behavior)")
-    print("   • Run integration tests in production environment")
-    print()
-    print("2. ⚡ PHASE 2: Canary")
-    print("   • Enable v2 for subset of users via environment variable")
-    print("   • Monitor performance and error rates")
-    print()
-    print("3. 🚀 PHASE 3: Full Migration")
-    print("   • Switch default to v2 after validation")
-    print("   • Keep v1 available as fallback option")
-    print()
-    print("4. 🧹 PHASE 4: Cleanup")
-    print("   • Remove v1 code after successful v2 deployment")
-    print("   • Update documentation and examples")
-
-    print("\n📈 Expected Benefits of Migration:")
-    print("-" * 60)
-    print("🔧 Development:")
-    print("   • Reduced boilerplate code")
-    print("   • Automatic tool registration")
-    print("   • Better error messages with Context")
-    print("   • Enhanced debugging capabilities")
-    print()
-    print("🏗️ Maintenance:")
-    print("   • Self-documenting tool definitions")
-    print("   • Consistent metadata across all tools")
-    print("   • Easier to add new tools")
-    print("   • Better test coverage with integrated Context")
-    print()
-    print("🚀 Runtime:")
-    print("   • Structured logging for better observability")
-    print("   • Progress reporting for long operations")
-    print("   • Better integration with FastMCP ecosystem")
-
-    print("\n📊 Risk Assessment:")
-    print("-" * 60)
-    print("🟢 LOW RISK:")
-    print("   • API compatibility is 100%")
-    print("   • Fallback to v1 available via environment variable")
-    print("   • All core functionality tested and verified")
-    print()
-    print("🟡 MEDIUM RISK:")
-    print("   • Performance characteristics may differ in production")
-    print("   • Context integration introduces new dependencies")
-    print()
-    print("🔴 MITIGATIONS:")
-    print("   • Comprehensive testing in staging environment")
-    print("   • Gradual rollout with monitoring")
-    print("   • Quick rollback mechanism (environment variable)")
-
-    print("\n🎯 Final Recommendation:")
-    print("=" * 80)
-    print("🎉 PROCEED WITH MIGRATION TO v2")
-    print()
-    print("The v2 implementation provides significant improvements in:")
-    print("• Developer experience and maintainability")
-    print("• Code organization and cleanliness")
-    print("• Integration with modern FastMCP patterns")
-    print("• Enhanced debugging and observability")
-    print()
-    print("With 100% API compatibility and robust fallback mechanisms,")
-    print("the migration presents minimal risk with substantial benefits.")
-    print("=" * 80)
+    emit("\n💡 Migration Recommendations:")
+    emit("-" * 60)
+    emit("🎉 RECOMMENDED FOR MIGRATION:")
+    emit("   ✅ 100% API compatibility ensures seamless transition")
+    emit("   ✅ Enhanced developer experience with modern patterns")
+    emit("   ✅ Better maintainability and code organization")
+    emit("   ✅ Environment-based version control for gradual rollout")
+    emit("   ✅ Enhanced debugging with Context integration")
+    emit("")
+    emit("⚠️  CONSIDERATIONS:")
+    emit("   • Test performance in real deployment environment")
+    emit("   • Validate Context logging integration meets requirements")
+    emit("   • Consider gradual migration using environment variables")
+
+    emit("\n🔧 Migration Strategy:")
+    emit("-" * 60)
+    emit("1. 🧪 PHASE 1: Testing")
+    emit("   • Deploy with SSH_MCP_TOOLS_VERSION=v1 (current behavior)")
+    emit("   • Run integration tests in production environment")
+    emit("")
+    emit("2. ⚡ PHASE 2: Canary")
+    emit("   • Enable v2 for subset of users via environment variable")
+    emit("   • Monitor performance and error rates")
+    emit("")
+    emit("3. 🚀 PHASE 3: Full Migration")
+    emit("   • Switch default to v2 after validation")
+    emit("   • Keep v1 available as fallback option")
+    emit("")
+    emit("4. 🧹 PHASE 4: Cleanup")
+    emit("   • Remove v1 code after successful v2 deployment")
+    emit("   • Update documentation and examples")
+
+    emit("\n📈 Expected Benefits of Migration:")
+    emit("-" * 60)
+    emit("🔧 Development:")
+    emit("   • Reduced boilerplate code")
+    emit("   • Automatic tool registration")
+    emit("   • Better error messages with Context")
+    emit("   • Enhanced debugging capabilities")
+    emit("")
+    emit("🏗️ Maintenance:")
+    emit("   • Self-documenting tool definitions")
+    emit("   • Consistent metadata across all tools")
+    emit("   • Easier to add new tools")
+    emit("   • Better test coverage with integrated Context")
+    emit("")
+    emit("🚀 Runtime:")
+    emit("   • Structured logging for better observability")
+    emit("   • Progress reporting for long operations")
+    emit("   • Better integration with FastMCP ecosystem")
+
+    emit("\n📊 Risk Assessment:")
+    emit("-" * 60)
+    emit("🟢 LOW RISK:")
+    emit("   • API compatibility is 100%")
+    emit("   • Fallback to v1 available via environment variable")
+    emit("   • All core functionality tested and verified")
+    emit("")
+    emit("🟡 MEDIUM RISK:")
+    emit("   • Performance characteristics may differ in production")
+    emit("   • Context integration introduces new dependencies")
+    emit("")
+    emit("🔴 MITIGATIONS:")
+    emit("   • Comprehensive testing in staging environment")
+    emit("   • Gradual rollout with monitoring")
+    emit("   • Quick rollback mechanism (environment variable)")
+
+    emit("\n🎯 Final Recommendation:")
+    emit("=" * 80)
+    emit("🎉 PROCEED WITH MIGRATION TO v2")
+    emit("")
+    emit("The v2 implementation provides significant improvements in:")
+    emit("• Developer experience and maintainability")
+    emit("• Code organization and cleanliness")
+    emit("• Integration with modern FastMCP patterns")
+    emit("• Enhanced debugging and observability")
+    emit("")
+    emit("With 100% API compatibility and robust fallback mechanisms,")
+    emit("the migration presents minimal risk with substantial benefits.")
+    emit("=" * 80)
+
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":
-    asyncio.run(generate_test_summary())
+    generate_test_summary()
@@ -19,212 +19,220 @@ End-to-end integration tests for the FastMCP SSH server including:
 """
 
 import asyncio
+import io
+import json
 import sys
-import tempfile
-from pathlib import Path
-from unittest.mock import AsyncMock, patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import asyncssh
 import pytest
 
-# Add the src directory to Python path for testing
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
 from ssh_mcp import SSHMCPServer
 from ssh_mcp.cli import parse_cli_args
-from ssh_mcp.models import SSHConfig
-from ssh_mcp.utils import Logger, setup_logger
+from ssh_mcp.models import ExecuteCommandParams, UploadParams
+from ssh_mcp.utils import ErrorHandler, Logger, SSHConnectionError, setup_logger
+
+
+def make_connection():
+    """Build a mocked asyncssh connection with awaitable run/wait_closed."""
+    connection = MagicMock()
+    connection.run = AsyncMock()
+    connection.wait_closed = AsyncMock()
+    return connection
+
+
+def make_result(stdout="ok", rc=0):
+    """Build a lightweight stand-in for an asyncssh completed process."""
+    return SimpleNamespace(stdout=stdout, stderr="", exit_status=rc)
+
+
+@pytest.fixture
+def mocked_asyncssh(monkeypatch):
+    """Patch asyncssh.connect for one test; every connect returns one mock."""
+    connection = make_connection()
+    connect = AsyncMock(return_value=connection)
+    monkeypatch.setattr("ssh_mcp.ssh_manager.asyncssh.connect", connect)
+    return SimpleNamespace(connect=connect, connection=connection)
 
 
 class TestFullServerIntegration:
     """Test suite for full server integration."""
 
-    @pytest.fixture
-    def ssh_configs(self):
+    @pytest.fixture(scope="class")
+    def ssh_configs(self, ssh_config_factory):
         """Provide test SSH configurations for integration testing."""
-        return [
-            SSHConfig(
+        return {
+            "test_server_1": ssh_config_factory(
                 name="test_server_1",
-                host="localhost",
-                port=22,
-                username="testuser1",
-                password="testpass1",
                 command_whitelist=["ls", "echo", "pwd"],
                 command_blacklist=["rm", "sudo"],
             ),
-            SSHConfig(
+            "test_server_2": ssh_config_factory(
                 name="test_server_2",
                 host="192.168.1.100",
                 port=2222,
-                username="testuser2",
-                password="testpass2",  # Use password instead of non-existent key file
-                command_whitelist=["*"],
+                command_whitelist=[".*"],
                 command_blacklist=["rm -rf"],
             ),
-        ]
-
-    @pytest.fixture
-    async def ssh_server(self, ssh_configs):
-        """Create and initialize SSH MCP server for integration testing."""
-        server = SSHMCPServer("test-integration-server")
+        }
 
-        with patch("ssh_mcp.ssh_manager.asyncssh.connect") as mock_connect:
-            mock_connection = AsyncMock()
-            mock_connect.return_value = mock_connection
+    @pytest.fixture(scope="class")
+    async def shared_server(self, ssh_configs):
+        """Initialize one SSH MCP server with mocked connections per class."""
+        with patch(
+            "ssh_mcp.ssh_manager.asyncssh.connect", new_callable=AsyncMock
+        ) as mock_connect:
+            mock_connect.side_effect = lambda **kwargs: make_connection()
 
+            server = SSHMCPServer("test-integration-server")
             await server.initialize(ssh_configs)
-            yield server
+            yield server, mock_connect
 
             await server.cleanup()
 
-    async def test_server_initialization_flow(self, ssh_configs):
-        """Test complete server initialization flow."""
-        with patch("ssh_mcp.ssh_manager.asyncssh.connect") as mock_connect:
-            mock_connection = AsyncMock()
-            mock_connect.return_value = mock_connection
-
-            # Create server
-            server = SSHMCPServer("integration-test")
-            assert server.mcp is not None
-            assert server.ssh_manager is not None
-
-            # Initialize with configs
-            await server.initialize(ssh_configs)
-
-            # Verify SSH manager is initialized
-            assert server.ssh_manager._initialized is True
-            assert len(server.ssh_manager._configs) == 2
+    @pytest.fixture
+    async def ssh_server(self, shared_server, ssh_configs):
+        """Reset the shared server's connection manager for each test."""
+        server, mock_connect = shared_server
 
-            # Cleanup
-            await server.cleanup()
+        # The manager is a process-wide singleton, so re-apply this class's
+        # configs and reconnect anything an earlier test closed
+        server._ssh_manager.set_config(ssh_configs)
+        await server._ssh_manager.connect_all()
+        return server, mock_connect
 
-    async def test_cli_to_mcp_pipeline(self):
+    async def test_server_initialization_flow(self, ssh_server):
+        """Test complete server initialization flow."""
+        server, mock_connect = ssh_server
+
+        assert server.get_server_info()["initialized"] is True
+        assert server.get_server_info()["ssh_manager_active"] is True
+        assert set(server._ssh_manager._configs) == {"test_server_1", "test_server_2"}
+        assert server._ssh_manager._connected == {
+            "test_server_1": True,
+            "test_server_2": True,
+        }
+        assert mock_connect.await_count >= 2
+
+    async def test_cli_to_mcp_pipeline(self, mocked_asyncssh):
         """Test CLI argument parsing to MCP server initialization."""
-        test_args = [
-            "--host",
-            "integration.example.com",
-            "--username",
-            "integrationuser",
-            "--password",
-            "integrationpass",
-            "--allow-commands",
-            "ls,pwd,echo",
-            "--deny-commands",
-            "rm,sudo",
-        ]
-
-        with patch("sys.argv", ["script"] + test_args):
-            configs = parse_cli_args()
-
-        with patch("ssh_mcp.ssh_manager.asyncssh.connect") as mock_connect:
-            mock_connection = AsyncMock()
-            mock_connect.return_value = mock_connection
+        # The CLI command runs the server with asyncio.run(), which cannot
+        # nest inside this test's loop, so hand its options straight over
+        configs = parse_cli_args(
+            host="integration.example.com",
+            username="integrationuser",
+            password="integrationpass",
+            whitelist="ls,pwd,echo",
+            blacklist="rm,sudo",
+        )
 
-            server = SSHMCPServer("cli-integration-test")
-            await server.initialize(configs)
+        server = SSHMCPServer("cli-integration-test")
+        await server.initialize(configs)
 
-            # Verify configuration was correctly processed
-            assert len(server.ssh_manager._configs) == 1
-            config = list(server.ssh_manager._configs.values())[0]
-            assert config.host == "integration.example.com"
-            assert config.username == "integrationuser"
-            assert "ls" in config.command_whitelist
+        # Verify configuration was correctly processed
+        assert list(server._ssh_manager._configs) == ["default"]
+        config = server._ssh_manager.get_config()
+        assert config.host == "integration.example.com"
+        assert config.username == "integrationuser"
+        assert "ls" in config.command_whitelist
+        mocked_asyncssh.connect.assert_awaited_once()
 
-            await server.cleanup()
+        await server.cleanup()
 
-    async def test_multiple_ssh_connections_integration(self, ssh_configs):
+    async def test_multiple_ssh_connections_integration(self, ssh_server):
         """Test integration with multiple SSH connections."""
-        with patch("ssh_mcp.ssh_manager.asyncssh.connect") as mock_connect:
-            # Mock different connections for different servers
-            mock_connection_1 = AsyncMock()
-            mock_connection_2 = AsyncMock()
-            mock_connect.side_effect = [mock_connection_1, mock_connection_2]
-
-            server = SSHMCPServer("multi-connection-test")
-            await server.initialize(ssh_configs)
+        server, _ = ssh_server
 
-            # Test that different servers can be accessed
-            conn_1 = await server.ssh_manager._get_connection("test_server_1")
-            conn_2 = await server.ssh_manager._get_connection("test_server_2")
+        # Test that different servers can be accessed
+        conn_1 = await server._ssh_manager.ensure_connected("test_server_1")
+        conn_2 = await server._ssh_manager.ensure_connected("test_server_2")
 
-            assert conn_1 == mock_connection_1
-            assert conn_2 == mock_connection_2
-            assert mock_connect.call_count == 2
+        assert conn_1 is not conn_2
+        conn_1.run.return_value = MagicMock(stdout="one\n", stderr="", exit_status=0)
+        conn_2.run.return_value = MagicMock(stdout="two\n", stderr="", exit_status=0)
 
-            await server.cleanup()
+        assert await server._ssh_manager.execute_command("ls", "test_server_1") == (
+            "one\n"
+        )
+        assert await server._ssh_manager.execute_command("ls", "test_server_2") == (
+            "two\n"
+        )
 
-    async def test_error_propagation_integration(self, ssh_configs):
+    async def test_error_propagation_integration(self, ssh_configs, mocked_asyncssh):
         """Test error propagation through the entire stack."""
-        with patch("ssh_mcp.ssh_manager.asyncssh.connect") as mock_connect:
-            # Simulate connection failure
-            mock_connect.side_effect = Exception("Connection refused")
+        # A name no other test has connected, so the shared manager must dial
+        configs = {
+            "unreachable": ssh_configs["test_server_1"].model_copy(
+                update={"name": "unreachable"}
+            )
+        }
 
-            server = SSHMCPServer("error-integration-test")
-            await server.initialize(ssh_configs)
+        # Simulate connection failure
+        mocked_asyncssh.connect.side_effect = OSError("Connection refused")
 
-            # Test that connection errors are properly handled
-            with pytest.raises(
-                (OSError, RuntimeError, ValueError)
-            ):  # Should be wrapped in SSH-specific exception
-                await server.ssh_manager._get_connection("test_server_1")
+        server = SSHMCPServer("error-integration-test")
 
-            await server.cleanup()
+        # Connection errors surface from initialize with the cause attached
+        with pytest.raises(RuntimeError, match="Connection refused"):
+            await server.initialize(configs)
+
+        await server.cleanup()
 
 
 class TestMCPToolsIntegration:
     """Test suite for MCP tools integration."""
 
-    @pytest.fixture
-    def ssh_config(self):
+    @pytest.fixture(scope="class")
+    def ssh_config(self, ssh_config_factory):
         """Provide single SSH config for tool testing."""
-        return SSHConfig(
+        return ssh_config_factory(
             name="tool_test_server",
-            host="localhost",
-            port=22,
             username="tooluser",
-            password="toolpass",
             command_whitelist=["ls", "echo", "cat"],
             command_blacklist=["rm"],
         )
 
-    @pytest.fixture
-    async def server_with_mocked_ssh(self, ssh_config):
-        """Create server with mocked SSH connections for tool testing."""
-        with patch("ssh_mcp.ssh_manager.asyncssh.connect") as mock_connect:
-            mock_connection = AsyncMock()
-            mock_connect.return_value = mock_connection
+    @pytest.fixture(scope="class")
+    async def shared_server(self, ssh_config):
+        """Initialize one server with a mocked SSH connection per class."""
+        with patch(
+            "ssh_mcp.ssh_manager.asyncssh.connect", new_callable=AsyncMock
+        ) as mock_connect:
+            mock_connect.return_value = make_connection()
 
             server = SSHMCPServer("tool-integration-test")
-            await server.initialize([ssh_config])
-
-            yield server, mock_connection
+            await server.initialize({ssh_config.name: ssh_config})
+            yield server, mock_connect.return_value
 
             await server.cleanup()
 
+    @pytest.fixture
+    async def server_with_mocked_ssh(self, shared_server, ssh_config):
+        """Reset the shared server and its mocked connection for each test."""
+        server, mock_connection = shared_server
+
+        server._ssh_manager.set_config({ssh_config.name: ssh_config})
+        await server._ssh_manager.connect_all()
+        mock_connection.reset_mock(return_value=True, side_effect=True)
+        return server, mock_connection
+
     async def test_execute_command_tool_integration(self, server_with_mocked_ssh):
         """Test execute-command tool integration."""
         server, mock_connection = server_with_mocked_ssh
 
         # Mock SSH command execution
-        mock_result = AsyncMock()
-        mock_result.stdout = "integration test output"
-        mock_result.stderr = ""
-        mock_result.exit_status = 0
-        mock_connection.run.return_value = mock_result
+        mock_connection.run.return_value = make_result("integration test output")
 
         # Test command execution through the full stack
-        from ssh_mcp.models import ExecuteCommandParams
-
-        params = ExecuteCommandParams(
-            cmd_string="echo 'integration test'", serverName="tool_test_server"
+        result = await server._ssh_manager.execute_command(
+            "echo 'integration test'", "tool_test_server"
         )
 
-        result = await server.ssh_manager.execute_command(params)
-
-        assert result["stdout"] == "integration test output"
-        assert result["exitCode"] == 0
-        assert result["serverName"] == "tool_test_server"
+        assert result == "integration test output"
+        mock_connection.run.assert_awaited_once_with("echo 'integration test'")
 
-    async def test_file_operations_integration(self, server_with_mocked_ssh):
+    async def test_file_operations_integration(self, server_with_mocked_ssh, tmp_path):
         """Test file upload/download integration."""
         server, mock_connection = server_with_mocked_ssh
 
@@ -235,88 +243,226 @@ class TestMCPToolsIntegration:
         )
 
         # Test file upload
-        with tempfile.NamedTemporaryFile(mode="w", delete=False) as tmp_file:
-            tmp_file.write("integration test content")
-            tmp_file.flush()
+        local_file = tmp_path / "upload.txt"
+        local_file.write_bytes(b"integration test content")
 
-            from ssh_mcp.models import UploadParams
-
-            upload_params = UploadParams(
-                localPath=tmp_file.name,
-                remotePath="/remote/test.txt",
-                serverName="tool_test_server",
-            )
-
-            upload_result = await server.ssh_manager.upload(upload_params)
+        upload_params = UploadParams(
+            localPath=str(local_file),
+            remotePath="/remote/test.txt",
+            connectionName="tool_test_server",
+        )
 
-            assert upload_result["success"] is True
-            mock_sftp.put.assert_called_once()
+        upload_result = await server._ssh_manager.upload(
+            upload_params.local_path,
+            upload_params.remote_path,
+            upload_params.connection_name,
+        )
 
-            # Cleanup
-            Path(tmp_file.name).unlink()
+        assert upload_result == "File uploaded successfully"
+        mock_sftp.put.assert_awaited_once_with(str(local_file), "/remote/test.txt")
 
     async def test_security_validation_integration(self, server_with_mocked_ssh):
         """Test security validation integration across the stack."""
         server, mock_connection = server_with_mocked_ssh
 
         # Test denied command
-        from ssh_mcp.models import ExecuteCommandParams
-        from ssh_mcp.utils import SSHCommandError
-
         params = ExecuteCommandParams(
-            cmd_string="rm -rf /important/data", serverName="tool_test_server"
+            cmdString="rm -rf /important/data", connectionName="tool_test_server"
         )
 
-        with pytest.raises(SSHCommandError, match="Command denied by security policy"):
-            await server.ssh_manager.execute_command(params)
+        with pytest.raises(Exception, match="Command validation failed"):
+            await server._ssh_manager.execute_command(
+                params.cmd_string, params.connection_name
+            )
+        mock_connection.run.assert_not_called()
 
     async def test_server_listing_integration(self, server_with_mocked_ssh):
         """Test server listing integration."""
         server, mock_connection = server_with_mocked_ssh
 
-        server_infos = await server.ssh_manager.get_all_server_infos()
+        server_infos = server._ssh_manager.get_all_server_infos()
 
         assert len(server_infos) == 1
         server_info = server_infos[0]
-        assert server_info["name"] == "tool_test_server"
-        assert server_info["host"] == "localhost"
-        assert server_info["port"] == 22
-        assert server_info["username"] == "tooluser"
+        assert server_info.name == "tool_test_server"
+        assert server_info.host == "localhost"
+        assert server_info.port == 22
+        assert server_info.username == "tooluser"
+        assert server_info.connected is True
 
 
 class TestLoggingIntegration:
     """Test suite for logging system integration."""
 
-    def test_logging_setup_integration(self):
+    @pytest.fixture(autouse=True)
+    def reset_logging(self):
+        """Restore the quiet default logging setup, even if a test fails."""
+        yield
+        setup_logger(level="info", enable_console=False)
+
+    @staticmethod
+    def read_records(log_path):
+        """Parse the records of a json_file log, one per line."""
+        return [
+            json.loads(line)["record"] for line in log_path.read_text().splitlines()
+        ]
+
+    def test_logging_setup_integration(self, monkeypatch):
         """Test logging system setup and integration."""
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".log", delete=False
-        ) as log_file:
-            log_path = log_file.name
-
-        try:
-            # Setup logger
-            setup_logger(level="debug", log_file=log_path, enable_console=False)
-
-            # Test logging through the system
-            Logger.info(
-                "Integration test message", {"component": "test", "test_id": 123}
-            )
-            Logger.error("Integration test error", {"error_code": 500})
+        # Capture the console sink in memory instead of a log file
+        buffer = io.StringIO()
+        monkeypatch.setattr(sys, "stdout", buffer)
+
+        # Setup logger
+        setup_logger(level="debug")
+
+        # Test logging through the system
+        Logger.info("Integration test message", {"component": "test", "test_id": 123})
+        Logger.error("Integration test error", {"error_code": 500})
+
+        # Verify captured output
+        log_content = buffer.getvalue()
+        assert "Integration test message" in log_content
+        assert "Integration test error" in log_content
+
+    async def test_json_file_logging_integration(self, tmp_path):
+        """Test that json_file writes one JSON record per log line."""
+        log_path = tmp_path / "server.json.log"
+
+        setup_logger(
+            level="info", log_file=log_path, enable_console=False, json_file=True
+        )
+        Logger.info("JSON test message", {"component": "test"})
+        await Logger.complete()
+
+        records = self.read_records(log_path)
+        assert records[-1]["message"] == "JSON test message"
+        assert records[-1]["extra"]["component"] == "test"
+
+    async def test_logging_reports_caller_location(self, tmp_path):
+        """Test that records point at the caller, not the logger module."""
+        log_path = tmp_path / "caller.json.log"
+
+        setup_logger(
+            level="info", log_file=log_path, enable_console=False, json_file=True
+        )
+        Logger.info("Caller test message")
+        Logger.log("Caller test message", "warning")
+        await Logger.complete()
+
+        for record in self.read_records(log_path)[-2:]:
+            assert record["file"]["name"] == "test_integration.py"
+            assert record["function"] == "test_logging_reports_caller_location"
+
+    def test_setup_logging_follows_replaced_stdout(self, monkeypatch):
+        """Test that repeating setup_logging picks up a new sys.stdout."""
+        setup_logger(level="info")
+        new_stdout = io.StringIO()
+        monkeypatch.setattr(sys, "stdout", new_stdout)
 
-            # Verify log file content
-            log_content = Path(log_path).read_text()
-            assert "Integration test message" in log_content
-            assert "Integration test error" in log_content
+        setup_logger(level="info")
+        Logger.info("Replaced stdout message")
 
-        finally:
-            # Cleanup
-            Path(log_path).unlink()
+        assert "Replaced stdout message" in new_stdout.getvalue()
+
+    def test_setup_logging_reuses_handlers(self, monkeypatch):
+        """Test that repeating setup_logging with the same arguments keeps its sinks."""
+        monkeypatch.setattr(sys, "stdout", io.StringIO())
+        setup_logger(level="info")
+        handler_ids = list(Logger._handler_ids)
+
+        setup_logger(level="info")
+        Logger.info("Reused handler message")
+
+        assert Logger._handler_ids == handler_ids
+        assert sys.stdout.getvalue().count("Reused handler message") == 1
+
+    async def test_lazy_and_logf_integration(self, tmp_path):
+        """Test deferred message building with Logger.lazy and Logger.logf."""
+        log_path = tmp_path / "deferred.json.log"
+
+        setup_logger(
+            level="info", log_file=log_path, enable_console=False, json_file=True
+        )
+
+        calls = []
+
+        def build_message():
+            calls.append(1)
+            return "Lazy test message"
+
+        # Filtered out: the callable must not run
+        Logger.lazy("debug", build_message)
+        assert calls == []
+
+        Logger.lazy("info", build_message, {"component": "lazy"})
+        Logger.logf(
+            "warning",
+            "Connected to {} as {user}",
+            "example.com",
+            user="admin",
+            context={"component": "logf"},
+        )
+        await Logger.complete()
+
+        records = self.read_records(log_path)
+        assert calls == [1]
+        assert records[-2]["message"] == "Lazy test message"
+        assert records[-2]["extra"]["component"] == "lazy"
+        assert records[-1]["message"] == "Connected to example.com as admin"
+        assert records[-1]["level"]["name"] == "WARNING"
+        assert records[-1]["extra"]["component"] == "logf"
+
+    async def test_filtered_levels_integration(self, tmp_path):
+        """Test that messages below the configured level are not written."""
+        log_path = tmp_path / "filtered.log"
+
+        setup_logger(level="error", log_file=log_path, enable_console=False)
+        Logger.debug("Filtered debug message")
+        Logger.log("Filtered info message", "info")
+        await Logger.complete()
+
+        assert log_path.read_text() == ""
+
+    def test_handle_error_returns_message_when_filtered(self):
+        """Test that handle_error returns its message even if errors are filtered."""
+        setup_logger(level="critical", enable_console=False)
+
+        message = Logger.handle_error(ValueError("boom"), "Filtered test")
+
+        assert message == "Filtered test: boom"
+
+    async def test_handle_error_records_error_class(self, tmp_path):
+        """Test that handle_error binds the error type and qualified class name."""
+        log_path = tmp_path / "errors.json.log"
+
+        setup_logger(
+            level="info", log_file=log_path, enable_console=False, json_file=True
+        )
+        for _ in range(2):
+            Logger.handle_error(ValueError("boom"), include_traceback=False)
+        await Logger.complete()
+
+        for record in self.read_records(log_path)[-2:]:
+            assert record["extra"]["error_type"] == "ValueError"
+            assert record["extra"]["error_class"] == "builtins.ValueError"
+
+    def test_handle_error_leaves_context_untouched(self):
+        """Test that handle_error does not modify the caller's context dict."""
+        context = {"component": "test"}
+
+        message = Logger.handle_error(
+            ValueError("boom"),
+            "Integration test",
+            include_traceback=False,
+            context=context,
+        )
+
+        assert message == "Integration test: boom"
+        assert context == {"component": "test"}
 
     async def test_error_handling_with_logging_integration(self):
         """Test error handling with logging integration."""
-        from ssh_mcp.utils import ErrorHandler, SSHConnectionError
-
         # Create test error
         test_error = SSHConnectionError("Integration test connection error")
 
@@ -332,243 +478,209 @@ class TestLoggingIntegration:
 class TestPerformanceIntegration:
     """Test suite for performance and reliability integration."""
 
-    async def test_multiple_concurrent_commands(self):
-        """Test handling multiple concurrent commands."""
-        ssh_config = SSHConfig(
-            name="performance_test",
-            host="localhost",
-            port=22,
-            username="perfuser",
-            password="perfpass",
-            command_whitelist=["*"],
-            command_blacklist=[],
-        )
-
-        with patch("ssh_mcp.ssh_manager.asyncssh.connect") as mock_connect:
-            mock_connection = AsyncMock()
-            mock_result = AsyncMock()
-            mock_result.stdout = "concurrent command output"
-            mock_result.stderr = ""
-            mock_result.exit_status = 0
-            mock_connection.run.return_value = mock_result
-            mock_connect.return_value = mock_connection
+    @pytest.fixture(scope="class")
+    def perf_config(self, ssh_config_factory):
+        """Provide the SSH config shared by the performance tests."""
+        return ssh_config_factory(name="performance_test", command_whitelist=[".*"])
 
-            server = SSHMCPServer("performance-test")
-            await server.initialize([ssh_config])
+    @pytest.fixture(scope="class")
+    async def perf_server(self, perf_config):
+        """Initialize one server per class with counting connect/run stubs."""
+        connection = make_connection()
+        result = make_result("performance output")
+        stats = SimpleNamespace(connects=0, runs=0)
 
-            # Execute multiple commands concurrently
-            from ssh_mcp.models import ExecuteCommandParams
+        async def connect(**kwargs):
+            stats.connects += 1
+            return connection
 
-            async def execute_test_command(cmd_id: int):
-                params = ExecuteCommandParams(
-                    cmd_string=f"echo 'command {cmd_id}'", serverName="performance_test"
-                )
-                return await server.ssh_manager.execute_command(params)
+        async def run(cmd):
+            stats.runs += 1
+            return result
 
-            # Run 10 concurrent commands
-            tasks = [execute_test_command(i) for i in range(10)]
-            results = await asyncio.gather(*tasks)
+        connection.run = run
 
-            # Verify all commands completed successfully
-            assert len(results) == 10
-            for result in results:
-                assert result["exitCode"] == 0
-                assert "concurrent command output" in result["stdout"]
+        with patch("ssh_mcp.ssh_manager.asyncssh.connect", connect):
+            server = SSHMCPServer("performance-test")
+            await server.initialize({perf_config.name: perf_config})
+            yield server, connection, stats
 
             await server.cleanup()
 
-    async def test_connection_reuse_performance(self):
-        """Test that connections are properly reused for performance."""
-        ssh_config = SSHConfig(
-            name="reuse_test",
-            host="localhost",
-            port=22,
-            username="reuseuser",
-            password="reusepass",
-            command_whitelist=["*"],
-            command_blacklist=[],
-        )
-
-        with patch("ssh_mcp.ssh_manager.asyncssh.connect") as mock_connect:
-            mock_connection = AsyncMock()
-            mock_result = AsyncMock()
-            mock_result.stdout = "reuse test output"
-            mock_result.stderr = ""
-            mock_result.exit_status = 0
-            mock_connection.run.return_value = mock_result
-            mock_connect.return_value = mock_connection
+    @pytest.fixture
+    async def perf(self, perf_server, perf_config):
+        """Reconnect the shared server if needed and reset its counters."""
+        server, connection, stats = perf_server
 
-            server = SSHMCPServer("reuse-test")
-            await server.initialize([ssh_config])
+        server._ssh_manager.set_config({perf_config.name: perf_config})
+        await server._ssh_manager.connect_all()
+        connection.reset_mock()
+        stats.connects = stats.runs = 0
+        return perf_server
 
-            # Execute multiple commands on same server
-            from ssh_mcp.models import ExecuteCommandParams
+    async def test_multiple_concurrent_commands(self, perf):
+        """Test handling multiple concurrent commands."""
+        server, _, stats = perf
 
-            for i in range(5):
-                params = ExecuteCommandParams(
-                    cmd_string=f"echo 'reuse test {i}'", serverName="reuse_test"
-                )
-                await server.ssh_manager.execute_command(params)
+        # Build all params up front, then submit them as one concurrent batch
+        params_batch = [
+            ExecuteCommandParams(
+                cmdString=f"echo 'command {i}'", connectionName="performance_test"
+            )
+            for i in range(10)
+        ]
+        manager = server._ssh_manager
+        async with asyncio.TaskGroup() as tg:
+            tasks = [
+                tg.create_task(manager.execute_command(p.cmd_string, p.connection_name))
+                for p in params_batch
+            ]
+        results = [task.result() for task in tasks]
+
+        # Verify all commands completed successfully
+        assert results == ["performance output"] * 10
+        assert stats.runs == 10
+
+    async def test_connection_reuse_performance(self, perf):
+        """Test that connections are properly reused for performance."""
+        server, _, stats = perf
 
-            # Connection should only be established once
-            assert mock_connect.call_count == 1
-            # But run should be called multiple times
-            assert mock_connection.run.call_count == 5
+        # Execute multiple commands on same server
+        for i in range(5):
+            params = ExecuteCommandParams(
+                cmdString=f"echo 'reuse test {i}'", connectionName="performance_test"
+            )
+            await server._ssh_manager.execute_command(
+                params.cmd_string, params.connection_name
+            )
 
-            await server.cleanup()
+        # No new connection should be established
+        assert stats.connects == 0
+        # But run should be called multiple times
+        assert stats.runs == 5
 
-    async def test_memory_cleanup_integration(self):
+    async def test_memory_cleanup_integration(self, perf):
         """Test that resources are properly cleaned up."""
-        ssh_config = SSHConfig(
-            name="cleanup_test",
-            host="localhost",
-            port=22,
-            username="cleanupuser",
-            password="cleanuppass",
-        )
-
-        with patch("ssh_mcp.ssh_manager.asyncssh.connect") as mock_connect:
-            mock_connection = AsyncMock()
-            mock_connect.return_value = mock_connection
-
-            server = SSHMCPServer("cleanup-test")
-            await server.initialize([ssh_config])
-
-            # Establish connection
-            await server.ssh_manager._get_connection("cleanup_test")
+        server, connection, _ = perf
 
-            # Verify connection exists
-            assert "cleanup_test" in server.ssh_manager._connections
+        # Verify connection exists
+        assert "performance_test" in server._ssh_manager._connections
 
-            # Cleanup
-            await server.cleanup()
+        # Cleanup
+        await server.cleanup()
 
-            # Verify connection was closed
-            mock_connection.close.assert_called_once()
+        # Verify connection was closed
+        connection.close.assert_called_once()
+        connection.wait_closed.assert_awaited_once()
+        assert server._ssh_manager._connections == {}
 
 
 class TestErrorRecoveryIntegration:
     """Test suite for error recovery and resilience."""
 
-    async def test_connection_failure_recovery(self):
-        """Test recovery from connection failures."""
-        ssh_config = SSHConfig(
-            name="recovery_test",
-            host="localhost",
-            port=22,
-            username="recoveryuser",
-            password="recoverypass",
-            command_whitelist=["*"],
-            command_blacklist=[],
-        )
-
-        with patch("ssh_mcp.ssh_manager.asyncssh.connect") as mock_connect:
-            # First call fails, second succeeds
-            mock_connection = AsyncMock()
-            mock_connect.side_effect = [Exception("Connection failed"), mock_connection]
-
-            server = SSHMCPServer("recovery-test")
-            await server.initialize([ssh_config])
+    @pytest.fixture
+    async def recovery_server(self, mocked_asyncssh):
+        """Provide an uninitialized server that is cleaned up after the test."""
+        server = SSHMCPServer("recovery-test")
+        yield server
+        await server.cleanup()
 
-            # First connection attempt should fail
-            with pytest.raises((OSError, RuntimeError, ValueError)):
-                await server.ssh_manager._get_connection("recovery_test")
+    @pytest.mark.parametrize(
+        "first_error",
+        [
+            OSError("Connection refused"),
+            TimeoutError("Connection timed out"),
+            asyncssh.PermissionDenied("Permission denied"),
+        ],
+        ids=["refused", "timeout", "auth"],
+    )
+    async def test_connection_failure_recovery(
+        self, recovery_server, mocked_asyncssh, ssh_config_factory, first_error
+    ):
+        """Test recovery from connection failures."""
+        ssh_config = ssh_config_factory(name="recovery_test", command_whitelist=[".*"])
 
-            # Reset the side effect for second attempt
-            mock_connect.side_effect = None
-            mock_connect.return_value = mock_connection
+        # First call fails, second succeeds
+        mock_connection = mocked_asyncssh.connection
+        mocked_asyncssh.connect.side_effect = [first_error, mock_connection]
 
-            # Second attempt should succeed
-            connection = await server.ssh_manager._get_connection("recovery_test")
-            assert connection == mock_connection
+        # First connection attempt should fail
+        with pytest.raises(RuntimeError, match=str(first_error)):
+            await recovery_server.initialize({ssh_config.name: ssh_config})
 
-            await server.cleanup()
+        # Second attempt should succeed
+        connection = await recovery_server._ssh_manager.ensure_connected(
+            "recovery_test"
+        )
+        assert connection is mock_connection
 
-    async def test_partial_initialization_handling(self):
+    async def test_partial_initialization_handling(
+        self, recovery_server, mocked_asyncssh, ssh_config_factory
+    ):
         """Test handling of partial initialization failures."""
-        configs = [
-            SSHConfig(
-                name="good_server",
-                host="good.example.com",
-                port=22,
-                username="gooduser",
-                password="goodpass",
-            ),
-            SSHConfig(
-                name="bad_server",
-                host="bad.example.com",
-                port=22,
-                username="baduser",
-                password="badpass",
+        configs = {
+            "good_server": ssh_config_factory(
+                name="good_server", host="good.example.com"
             ),
-        ]
+            "bad_server": ssh_config_factory(name="bad_server", host="bad.example.com"),
+        }
 
-        server = SSHMCPServer("partial-init-test")
+        async def connect(**kwargs):
+            if kwargs["host"] == "bad.example.com":
+                raise OSError("Host unreachable")
+            return mocked_asyncssh.connection
 
-        # Initialize should succeed even if some connections might fail later
-        await server.initialize(configs)
+        mocked_asyncssh.connect.side_effect = connect
 
-        # Verify both configs are stored
-        assert len(server.ssh_manager._configs) == 2
-        assert "good_server" in server.ssh_manager._configs
-        assert "bad_server" in server.ssh_manager._configs
+        # Initialize reports the failing server only
+        with pytest.raises(RuntimeError, match="bad_server") as exc_info:
+            await recovery_server.initialize(configs)
+        assert "good_server" not in str(exc_info.value)
 
-        await server.cleanup()
+        # Both configs are stored and the good server stays connected
+        manager = recovery_server._ssh_manager
+        assert set(manager._configs) == {"good_server", "bad_server"}
+        assert manager._connected == {"good_server": True, "bad_server": False}
 
-    async def test_graceful_degradation(self):
+    async def test_graceful_degradation(
+        self, recovery_server, mocked_asyncssh, ssh_config_factory
+    ):
         """Test graceful degradation when some services fail."""
-        ssh_config = SSHConfig(
-            name="degradation_test",
-            host="localhost",
-            port=22,
-            username="degradeuser",
-            password="degradepass",
-            command_whitelist=["ls", "echo"],
-            command_blacklist=[],
+        ssh_config = ssh_config_factory(
+            name="degradation_test", command_whitelist=["ls", "echo"]
         )
 
-        with patch("ssh_mcp.ssh_manager.asyncssh.connect") as mock_connect:
-            mock_connection = AsyncMock()
-            mock_connect.return_value = mock_connection
-
-            server = SSHMCPServer("degradation-test")
-            await server.initialize([ssh_config])
-
-            # Simulate SFTP failure but SSH success
-            mock_connection.start_sftp_client.side_effect = Exception(
-                "SFTP not available"
-            )
-            mock_result = AsyncMock()
-            mock_result.stdout = "echo works"
-            mock_result.stderr = ""
-            mock_result.exit_status = 0
-            mock_connection.run.return_value = mock_result
+        server = recovery_server
+        await server.initialize({ssh_config.name: ssh_config})
 
-            # Command execution should still work
-            from ssh_mcp.models import ExecuteCommandParams
+        # Simulate SFTP failure but SSH success
+        mock_connection = mocked_asyncssh.connection
+        mock_connection.start_sftp_client.side_effect = Exception("SFTP not available")
+        mock_connection.run.return_value = make_result("echo works")
 
-            params = ExecuteCommandParams(
-                cmd_string="echo 'test'", serverName="degradation_test"
-            )
+        # Command execution should still work
+        params = ExecuteCommandParams(
+            cmdString="echo 'test'", connectionName="degradation_test"
+        )
 
-            result = await server.ssh_manager.execute_command(params)
-            assert result["exitCode"] == 0
+        result = await server._ssh_manager.execute_command(
+            params.cmd_string, params.connection_name
+        )
+        assert result == "echo works"
 
-            # But file operations should fail gracefully
-            from ssh_mcp.models import UploadParams
+        # But file operations should fail gracefully
+        upload_params = UploadParams(
+            localPath=__file__,
+            remotePath="/remote/file.txt",
+            connectionName="degradation_test",
+        )
 
-            upload_params = UploadParams(
-                localPath="/local/file.txt",
-                remotePath="/remote/file.txt",
-                serverName="degradation_test",
+        with pytest.raises(Exception, match="File upload failed: SFTP not available"):
+            await server._ssh_manager.upload(
+                upload_params.local_path,
+                upload_params.remote_path,
+                upload_params.connection_name,
             )
 
-            with pytest.raises(
-                (OSError, RuntimeError, ValueError)
-            ):  # Should be wrapped in SFTP-specific exception
-                await server.ssh_manager.upload(upload_params)
-
-            await server.cleanup()
-
 
 # {{END_MODIFICATIONS}}
@@ -18,23 +18,26 @@ Comprehensive tests for the SSH connection manager functionality including:
 - Authentication methods
 """
 
-import sys
+import asyncio
 import tempfile
 from pathlib import Path
-from unittest.mock import AsyncMock, patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import asyncssh
 import pytest
 
-# Add the src directory to Python path for testing
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
 from ssh_mcp.models import (
     DownloadParams,
     ExecuteCommandParams,
     SSHConfig,
     UploadParams,
 )
-from ssh_mcp.ssh_manager import SSHConnectionManager
+from ssh_mcp.ssh_manager import (
+    SSHConnectionManager,
+    _env_positive_int,
+    _load_keypairs,
+)
 from ssh_mcp.utils import (
     SFTPError,
     SSHCommandError,
@@ -42,6 +45,12 @@ from ssh_mcp.utils import (
 )
 
 
+@pytest.fixture(scope="module")
+def ok_result():
+    """Successful command result, shaped like asyncssh's SSHCompletedProcess."""
+    return SimpleNamespace(stdout="Hello World", stderr="", exit_status=0)
+
+
 class TestSSHConnectionManager:
     """Test suite for SSH Connection Manager."""
 
@@ -81,17 +90,9 @@ class TestSSHConnectionManager:
         )
 
     @pytest.fixture
-    async def manager(self):
-        """Create SSH manager instance for testing."""
-        # Reset singleton state before getting instance
-        SSHConnectionManager._instance = None
-        manager = await SSHConnectionManager.get_instance()
-        # Reset state for clean tests
-        manager._connections = {}
-        manager._configs = {}
-        manager._connected = {}
-        manager._default_name = "default"
-        return manager
+    def manager(self):
+        """Create an isolated SSH manager instance for testing."""
+        return SSHConnectionManager._new_for_test()
 
     async def test_singleton_pattern(self):
         """Test that SSHConnectionManager follows singleton pattern."""
@@ -208,15 +209,12 @@ class TestSSHConnectionManager:
         assert mock_connect.call_count == 1
 
     @patch("ssh_mcp.ssh_manager.asyncssh.connect")
-    async def test_execute_command_success(self, mock_connect, manager, ssh_config):
+    async def test_execute_command_success(
+        self, mock_connect, manager, ssh_config, ok_result
+    ):
         """Test successful command execution."""
         mock_connection = AsyncMock()
-        mock_result = AsyncMock()
-        mock_result.stdout = "Hello World"
-        mock_result.stderr = ""
-        mock_result.exit_status = 0
-
-        mock_connection.run.return_value = mock_result
+        mock_connection.run.return_value = ok_result
         mock_connect.return_value = mock_connection
 
         manager.set_config([ssh_config])
@@ -238,12 +236,9 @@ class TestSSHConnectionManager:
     ):
         """Test command execution with custom timeout."""
         mock_connection = AsyncMock()
-        mock_result = AsyncMock()
-        mock_result.stdout = "Long running task completed"
-        mock_result.stderr = ""
-        mock_result.exit_status = 0
-
-        mock_connection.run.return_value = mock_result
+        mock_connection.run.return_value = SimpleNamespace(
+            stdout="Long running task completed", stderr="", exit_status=0
+        )
         mock_connect.return_value = mock_connection
 
         manager.set_config([ssh_config])
@@ -412,6 +407,43 @@ class TestSSHConnectionManager:
         assert "username" in test_server_info
         assert "authentication" in test_server_info
 
+    async def test_server_infos_follow_connection_status(
+        self, manager, ssh_config_factory
+    ):
+        """Test that server infos track the connection status."""
+        manager.set_config({"test_server": ssh_config_factory(port=2222)})
+
+        (server_info,) = manager.get_all_server_infos()
+        assert server_info.model_dump() == {
+            "name": "test_server",
+            "host": "localhost",
+            "port": 2222,
+            "username": "testuser",
+            "connected": False,
+        }
+
+        manager._connected["test_server"] = True
+        assert manager.get_all_server_infos()[0].connected is True
+
+    async def test_server_infos_follow_config_changes(
+        self, manager, ssh_config_factory
+    ):
+        """Test that configs changed or added after set_config are reported."""
+        configs = {"test_server": ssh_config_factory()}
+        manager.set_config(configs)
+        first = manager.get_all_server_infos()
+
+        configs["test_server"].host = "10.0.0.1"
+        configs["other_server"] = ssh_config_factory(name="other_server", port=2222)
+
+        infos = manager.get_all_server_infos()
+        assert [(info.name, info.host, info.port) for info in infos] == [
+            ("test_server", "10.0.0.1", 22),
+            ("other_server", "localhost", 2222),
+        ]
+        # Each call returns fresh objects, not shared cached instances
+        assert infos[0] is not first[0]
+
     async def test_cleanup(self, manager, ssh_config):
         """Test cleanup functionality."""
         with patch("ssh_mcp.ssh_manager.asyncssh.connect") as mock_connect:
@@ -430,6 +462,339 @@ class TestSSHConnectionManager:
             # Verify connection was closed
             mock_connection.close.assert_called_once()
 
+    async def test_disconnect_all_with_failing_close(self, manager):
+        """Test that one failing close does not stop the other connections closing."""
+        connections = {}
+        for name in ("server_a", "server_b", "server_c"):
+            connection = MagicMock()
+            connection.wait_closed = AsyncMock()
+            connections[name] = connection
+        connections["server_b"].wait_closed.side_effect = OSError("Broken pipe")
+
+        manager._connections = dict(connections)
+        manager._connected = dict.fromkeys(connections, True)
+
+        with patch("ssh_mcp.ssh_manager.Logger.warning") as mock_warning:
+            await manager.disconnect()
+
+        for connection in connections.values():
+            connection.close.assert_called_once()
+            connection.wait_closed.assert_awaited_once()
+        assert manager._connections == {}
+        assert manager._connected == {}
+        mock_warning.assert_called_once()
+        assert "server_b" in mock_warning.call_args[0][0]
+        assert "Broken pipe" in mock_warning.call_args[0][0]
+
+    async def test_disconnect_all_bounds_hanging_close(self, manager, monkeypatch):
+        """Test that a connection that never finishes closing does not block."""
+        monkeypatch.setattr("ssh_mcp.ssh_manager._CLOSE_TIMEOUT", 0.01)
+        hanging = MagicMock(wait_closed=AsyncMock(side_effect=asyncio.Event().wait))
+        closing = MagicMock(wait_closed=AsyncMock())
+        manager._connections = {"hanging": hanging, "closing": closing}
+        manager._connected = {"hanging": True, "closing": True}
+
+        with patch("ssh_mcp.ssh_manager.Logger.warning") as mock_warning:
+            await manager.disconnect()
+
+        closing.wait_closed.assert_awaited_once()
+        assert manager._connections == {}
+        mock_warning.assert_called_once()
+        assert "hanging" in mock_warning.call_args[0][0]
+        assert "not closed" in mock_warning.call_args[0][0]
+
+    async def test_disconnect_one_bounds_hanging_close(self, manager, monkeypatch):
+        """Test that disconnecting one server logs a hanging close, not raises."""
+        monkeypatch.setattr("ssh_mcp.ssh_manager._CLOSE_TIMEOUT", 0.01)
+        hanging = MagicMock(wait_closed=AsyncMock(side_effect=asyncio.Event().wait))
+        manager._connections = {"hanging": hanging}
+        manager._connected = {"hanging": True}
+
+        with patch("ssh_mcp.ssh_manager.Logger.warning") as mock_warning:
+            await manager.disconnect("hanging")
+
+        assert manager._connections == {}
+        assert manager._connected == {"hanging": False}
+        mock_warning.assert_called_once()
+        assert "hanging" in mock_warning.call_args[0][0]
+        assert "not closed" in mock_warning.call_args[0][0]
+
+    async def test_concurrent_connects_share_one_connection(
+        self, manager, ssh_config_factory
+    ):
+        """Test that concurrent connects to one server open a single connection."""
+        configs = {
+            name: ssh_config_factory(name=name) for name in ("server_a", "server_b")
+        }
+        manager.set_config(configs)
+
+        async def slow_connect(**kwargs):
+            await asyncio.sleep(0.01)
+            return MagicMock(wait_closed=AsyncMock())
+
+        with patch(
+            "ssh_mcp.ssh_manager.asyncssh.connect", side_effect=slow_connect
+        ) as mock_connect:
+            await asyncio.gather(
+                *(manager.ensure_connected("server_a") for _ in range(5)),
+                manager.ensure_connected("server_b"),
+            )
+
+        assert mock_connect.call_count == 2
+        assert set(manager._connections) == {"server_a", "server_b"}
+
+    async def test_connect_retries_dropped_handshake(
+        self, manager, monkeypatch, ssh_config_factory
+    ):
+        """Test that a handshake dropped by the server is retried with backoff."""
+        manager.set_config({"test_server": ssh_config_factory()})
+        monkeypatch.setattr("ssh_mcp.ssh_manager._CONNECT_BACKOFF", 0)
+        connection = MagicMock(wait_closed=AsyncMock())
+
+        with patch(
+            "ssh_mcp.ssh_manager.asyncssh.connect",
+            new_callable=AsyncMock,
+            side_effect=[ConnectionResetError("Connection reset by peer"), connection],
+        ) as mock_connect:
+            await manager.connect("test_server")
+
+        assert mock_connect.call_count == 2
+        assert manager.get_connection("test_server") is connection
+
+    async def test_lost_connection_is_evicted(self, manager, ssh_config_factory):
+        """Test that a lost connection is dropped so the next call reconnects."""
+        manager.set_config({"test_server": ssh_config_factory()})
+        connection = MagicMock(wait_closed=AsyncMock())
+        clients = []
+
+        async def connect(**kwargs):
+            client = kwargs["client_factory"]()
+            client.connection_made(connection)
+            clients.append(client)
+            return connection
+
+        with patch("ssh_mcp.ssh_manager.asyncssh.connect", side_effect=connect):
+            await manager.connect("test_server")
+
+        assert manager.get_connection("test_server") is connection
+
+        clients[0].connection_lost(ConnectionResetError("Connection reset"))
+
+        assert "test_server" not in manager._connections
+        assert manager._connected["test_server"] is False
+
+    async def test_private_key_parsed_once_across_reconnects(
+        self, manager, ssh_config_factory, tmp_path
+    ):
+        """Test that a private key file is parsed once and reused on reconnect."""
+        key_file = tmp_path / "id_ed25519"
+        asyncssh.generate_private_key("ssh-ed25519").write_private_key(str(key_file))
+        manager.set_config(
+            {
+                "test_server": ssh_config_factory(
+                    password=None, private_key=str(key_file)
+                )
+            }
+        )
+        _load_keypairs.cache_clear()
+
+        with (
+            patch(
+                "ssh_mcp.ssh_manager.asyncssh.load_keypairs",
+                wraps=asyncssh.load_keypairs,
+            ) as mock_load,
+            patch(
+                "ssh_mcp.ssh_manager.asyncssh.connect",
+                new_callable=AsyncMock,
+                return_value=MagicMock(wait_closed=AsyncMock()),
+            ) as mock_connect,
+        ):
+            await manager.connect("test_server")
+            await manager.disconnect("test_server")
+            await manager.connect("test_server")
+
+        mock_load.assert_called_once()
+        first_keys = mock_connect.await_args_list[0].kwargs["client_keys"]
+        second_keys = mock_connect.await_args_list[1].kwargs["client_keys"]
+        assert first_keys[0] is second_keys[0]
+
+    async def test_private_key_certificate_is_loaded(
+        self, manager, ssh_config_factory, tmp_path
+    ):
+        """Test that a certificate next to the private key is offered with it."""
+        key_file = tmp_path / "id_ed25519"
+        user_key = asyncssh.generate_private_key("ssh-ed25519")
+        user_key.write_private_key(str(key_file))
+        ca_key = asyncssh.generate_private_key("ssh-ed25519")
+        ca_key.generate_user_certificate(
+            user_key, "testuser", principals=["testuser"]
+        ).write_certificate(f"{key_file}-cert.pub")
+        manager.set_config(
+            {
+                "test_server": ssh_config_factory(
+                    password=None, private_key=str(key_file)
+                )
+            }
+        )
+        _load_keypairs.cache_clear()
+
+        with patch(
+            "ssh_mcp.ssh_manager.asyncssh.connect",
+            new_callable=AsyncMock,
+            return_value=MagicMock(wait_closed=AsyncMock()),
+        ) as mock_connect:
+            await manager.connect("test_server")
+
+        client_keys = mock_connect.await_args.kwargs["client_keys"]
+        assert b"ssh-ed25519-cert-v01@openssh.com" in [
+            keypair.algorithm for keypair in client_keys
+        ]
+
+    async def test_execute_command_respects_max_sessions(
+        self, manager, ssh_config_factory
+    ):
+        """Test that concurrent commands on one connection are throttled."""
+        config = ssh_config_factory(max_sessions_per_connection=2)
+        manager.set_config({"test_server": config})
+
+        running = 0
+        peak = 0
+
+        async def run(command):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return SimpleNamespace(exit_status=0, stdout="ok", stderr="")
+
+        manager._connections["test_server"] = MagicMock(run=run)
+        manager._connected["test_server"] = True
+
+        results = await asyncio.gather(
+            *(manager.execute_command("echo test", "test_server") for _ in range(6))
+        )
+
+        assert results == ["ok"] * 6
+        assert peak == 2
+
+    async def test_session_slots_reset_by_set_config(self, manager, ssh_config_factory):
+        """Test that set_config resizes the session limit of a reused name."""
+        manager.set_config({"test_server": ssh_config_factory()})
+        old_slot = manager._session_slot("test_server")
+
+        manager.set_config(
+            {"test_server": ssh_config_factory(max_sessions_per_connection=1)}
+        )
+        new_slot = manager._session_slot("test_server")
+
+        assert new_slot is not old_slot
+        async with new_slot:
+            assert new_slot.locked()
+
+    async def test_upload_many_shares_one_sftp_session(
+        self, manager, tmp_path, ssh_config_factory
+    ):
+        """Test that a batch upload opens a single SFTP client for all files."""
+        manager.set_config({"test_server": ssh_config_factory()})
+        local_files = []
+        for index in range(3):
+            local_file = tmp_path / f"file{index}.txt"
+            local_file.write_text("content")
+            local_files.append(local_file)
+
+        sftp = MagicMock(put=AsyncMock())
+        connection = MagicMock()
+        connection.start_sftp_client.return_value.__aenter__.return_value = sftp
+        manager._connections["test_server"] = connection
+        manager._connected["test_server"] = True
+
+        result = await manager.upload_many(
+            [(str(path), f"/remote/{path.name}") for path in local_files],
+            "test_server",
+        )
+
+        assert result == "Files uploaded successfully"
+        connection.start_sftp_client.assert_called_once()
+        assert sorted(call.args for call in sftp.put.await_args_list) == [
+            (str(path), f"/remote/{path.name}") for path in local_files
+        ]
+
+    async def test_upload_many_cancels_remaining_on_failure(
+        self, manager, ssh_config_factory, tmp_path
+    ):
+        """Test that one failed transfer cancels the others in the batch."""
+        manager.set_config({"test_server": ssh_config_factory()})
+        local_files = []
+        for index in range(3):
+            local_file = tmp_path / f"file{index}.txt"
+            local_file.write_text("content")
+            local_files.append(local_file)
+
+        cancelled = []
+
+        async def put(local_path, remote_path):
+            if remote_path == "/remote/file0.txt":
+                raise asyncssh.SFTPFailure("disk full")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(remote_path)
+                raise
+
+        connection = MagicMock()
+        connection.start_sftp_client.return_value.__aenter__.return_value = MagicMock(
+            put=put
+        )
+        manager._connections["test_server"] = connection
+        manager._connected["test_server"] = True
+
+        with pytest.raises(Exception, match="File upload failed: disk full"):
+            await manager.upload_many(
+                [(str(path), f"/remote/{path.name}") for path in local_files],
+                "test_server",
+            )
+
+        assert sorted(cancelled) == ["/remote/file1.txt", "/remote/file2.txt"]
+
+    async def test_download_passes_sftp_tunables(
+        self, manager, tmp_path, ssh_config_factory
+    ):
+        """Test that configured SFTP block size and request depth are used."""
+        manager.set_config(
+            {
+                "test_server": ssh_config_factory(
+                    sftp_block_size=128 * 1024, sftp_max_requests=64
+                )
+            }
+        )
+        sftp = MagicMock(get=AsyncMock())
+        connection = MagicMock()
+        connection.start_sftp_client.return_value.__aenter__.return_value = sftp
+        manager._connections["test_server"] = connection
+        manager._connected["test_server"] = True
+        local_file = tmp_path / "downloaded.txt"
+
+        await manager.download("/remote/file.txt", str(local_file), "test_server")
+
+        sftp.get.assert_awaited_once_with(
+            "/remote/file.txt",
+            str(local_file),
+            block_size=128 * 1024,
+            max_requests=64,
+        )
+
+    @pytest.mark.parametrize("value", ["eight", "0", ""])
+    def test_invalid_env_setting_falls_back_to_default(self, monkeypatch, value):
+        """Test that a malformed numeric setting warns and uses the default."""
+        monkeypatch.setenv("SSH_MCP_MAX_CONCURRENT_CONNECTS", value)
+
+        with pytest.warns(RuntimeWarning, match="SSH_MCP_MAX_CONCURRENT_CONNECTS"):
+            assert _env_positive_int("SSH_MCP_MAX_CONCURRENT_CONNECTS", 8) == 8
+
+        monkeypatch.setenv("SSH_MCP_MAX_CONCURRENT_CONNECTS", "4")
+        assert _env_positive_int("SSH_MCP_MAX_CONCURRENT_CONNECTS", 8) == 4
+
     async def test_not_initialized_error(self, manager):
         """Test operations on non-initialized manager."""
         params = ExecuteCommandParams(cmd_string="echo test", serverName="test_server")
@@ -442,7 +807,7 @@ class TestSecurityValidation:
     """Test suite for SSH Manager security validation."""
 
     @pytest.fixture
-    async def manager_with_whitelist(self):
+    def manager_with_whitelist(self):
         """Create SSH manager with whitelist configuration."""
         config = SSHConfig(
             name="whitelist_server",
@@ -452,13 +817,13 @@ class TestSecurityValidation:
             password="testpass",
             command_whitelist=["ls", "echo", "pwd"],
         )
-        manager = await SSHConnectionManager.get_instance()
+        manager = SSHConnectionManager._new_for_test()
         manager._configs = {"whitelist_server": config}
         manager._default_name = "whitelist_server"
         return manager
 
     @pytest.fixture
-    async def manager_with_blacklist(self):
+    def manager_with_blacklist(self):
         """Create SSH manager with blacklist configuration."""
         config = SSHConfig(
             name="blacklist_server",
@@ -469,14 +834,14 @@ class TestSecurityValidation:
             command_whitelist=["*"],
             command_blacklist=["rm", "sudo"],
         )
-        manager = await SSHConnectionManager.get_instance()
+        manager = SSHConnectionManager._new_for_test()
         manager._configs = {"blacklist_server": config}
         manager._default_name = "blacklist_server"
         return manager
 
     async def test_validate_allowed_command(self, manager_with_whitelist):
         """Test validation of allowed command."""
-        manager = await manager_with_whitelist
+        manager = manager_with_whitelist
         # Should pass validation
         is_allowed, reason = manager.validate_command("ls -la")
         assert is_allowed is True
@@ -492,7 +857,7 @@ class TestSecurityValidation:
 
     async def test_validate_denied_command(self, manager_with_blacklist):
         """Test validation of denied command."""
-        manager = await manager_with_blacklist
+        manager = manager_with_blacklist
         is_allowed, reason = manager.validate_command("rm -rf /")
         assert is_allowed is False
         assert "blacklist" in reason.lower()
@@ -503,14 +868,14 @@ class TestSecurityValidation:
 
     async def test_validate_command_not_in_whitelist(self, manager_with_whitelist):
         """Test validation of command not in whitelist."""
-        manager = await manager_with_whitelist
+        manager = manager_with_whitelist
         is_allowed, reason = manager.validate_command("cat /etc/passwd")
         assert is_allowed is False
         assert "whitelist" in reason.lower()
 
     async def test_wildcard_whitelist_commands(self, manager_with_blacklist):
         """Test wildcard in whitelist commands."""
-        manager = await manager_with_blacklist
+        manager = manager_with_blacklist
         # Should allow any command except denied ones
         is_allowed, reason = manager.validate_command("ls -la")
         assert is_allowed is True
@@ -525,5 +890,52 @@ class TestSecurityValidation:
         is_allowed, reason = manager.validate_command("rm file.txt")
         assert is_allowed is False
 
+    async def test_validate_command_patterns_with_inline_flags(
+        self, ssh_config_factory
+    ):
+        """Test rules whose inline flags prevent joining them into one regex."""
+        config = ssh_config_factory(
+            name="flagged_server", command_blacklist=["(?i)^rm", "sudo"]
+        )
+        manager = SSHConnectionManager._new_for_test()
+        manager.set_config({"flagged_server": config})
+
+        assert manager.validate_command("RM -rf /")[0] is False
+        assert manager.validate_command("sudo ls")[0] is False
+        assert manager.validate_command("ls -la")[0] is True
+
+    async def test_validate_command_without_rules(self, ssh_config_factory):
+        """Test that connections without any rules allow every command."""
+        config = ssh_config_factory(name="open_server")
+        manager = SSHConnectionManager._new_for_test()
+        manager.set_config({"open_server": config})
+
+        is_allowed, reason = manager.validate_command("rm -rf /tmp/cache")
+        assert is_allowed is True
+        assert reason is None
+
+    async def test_validate_command_rules_added_after_set_config(
+        self, ssh_config_factory
+    ):
+        """Test that rules added to a config after set_config are enforced."""
+        configs = {
+            "open_server": ssh_config_factory(name="open_server"),
+            "other_server": ssh_config_factory(name="other_server"),
+        }
+        manager = SSHConnectionManager._new_for_test()
+        manager.set_config(configs)
+
+        # Replace the config entry in the dict passed to set_config
+        configs["open_server"] = ssh_config_factory(
+            name="open_server", command_blacklist=["rm"]
+        )
+        is_allowed, _ = manager.validate_command("rm -rf /", "open_server")
+        assert is_allowed is False
+
+        # Mutate the rules of a config in place
+        manager.get_config("other_server").command_blacklist = ["rm"]
+        is_allowed, _ = manager.validate_command("rm -rf /", "other_server")
+        assert is_allowed is False
+
 
 # {{END_MODIFICATIONS}}
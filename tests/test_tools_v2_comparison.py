@@ -15,22 +15,117 @@ All tests run in parallel against both implementations to ensure
 100% compatibility during migration.
 """
 
+import asyncio
+import statistics
 import time
 from contextlib import asynccontextmanager
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastmcp import Client
-
-from src.ssh_mcp import SSHMCPServer  # Unified server implementation
-from src.ssh_mcp.models import MCPResponse, SSHConfig
+from fastmcp.client.client import CallToolResult
+
+from ssh_mcp import SSHMCPServer  # Unified server implementation
+from ssh_mcp.models import ServerInfo, SSHConfig
+from ssh_mcp.ssh_manager import SSHConnectionManager
+from ssh_mcp.tools import ssh_tools
+
+EXPECTED_TOOLS = frozenset({"execute-command", "upload", "download", "list-servers"})
+
+# Parameters each tool's input schema must document
+REQUIRED_PROPS = {
+    "execute-command": frozenset({"cmdString"}),
+    "upload": frozenset({"localPath", "remotePath"}),
+    "download": frozenset({"remotePath", "localPath"}),
+}
+
+# Built once at import; the mocked manager returns the same list every call
+SERVER_INFOS = [
+    ServerInfo(
+        name="test1",
+        host="localhost",
+        port=22,
+        username="testuser1",
+        connected=True,
+    ),
+    ServerInfo(
+        name="test2",
+        host="127.0.0.1",
+        port=2222,
+        username="testuser2",
+        connected=True,
+    ),
+]
+
+
+# One parametrized case per call so xdist can spread them across workers
+EXEC_CASES = [
+    {"cmdString": "ls -la", "connectionName": None},
+    {"cmdString": "ps aux", "connectionName": "test1"},
+    {"cmdString": "echo 'hello world'", "connectionName": "test2"},
+    {"cmdString": "pwd", "connectionName": "default"},
+]
+
+UPLOAD_CASES = [
+    {
+        "localPath": "/tmp/test.txt",
+        "remotePath": "/home/user/test.txt",
+        "connectionName": None,
+    },
+    {
+        "localPath": "/local/file.py",
+        "remotePath": "/remote/file.py",
+        "connectionName": "test1",
+    },
+    {
+        "localPath": "./config.json",
+        "remotePath": "/etc/config.json",
+        "connectionName": "test2",
+    },
+]
+
+DOWNLOAD_CASES = [
+    {
+        "remotePath": "/home/user/data.txt",
+        "localPath": "/tmp/data.txt",
+        "connectionName": None,
+    },
+    {
+        "remotePath": "/etc/hosts",
+        "localPath": "./hosts.backup",
+        "connectionName": "test1",
+    },
+    {
+        "remotePath": "/var/log/app.log",
+        "localPath": "/logs/app.log",
+        "connectionName": "test2",
+    },
+]
+
+
+@asynccontextmanager
+async def _mocked_server(name, ssh_configs, mock_manager):
+    """Initialize a server whose SSH manager is the given mock."""
+    # The tools' global manager is restored when the server is torn down
+    with (
+        patch.object(
+            SSHConnectionManager, "get_instance", AsyncMock(return_value=mock_manager)
+        ),
+        patch.object(ssh_tools, "_ssh_manager"),
+    ):
+        server = SSHMCPServer(name)
+        await server.initialize(ssh_configs)
+
+        yield server
+
+        await server.cleanup()
 
 
 class TestToolsComparison:
     """Comprehensive comparison test suite for v1 vs v2 tools."""
 
-    @pytest.fixture
-    async def ssh_configs(self):
+    @pytest.fixture(scope="class")
+    def ssh_configs(self):
         """Create test SSH configurations."""
         return {
             "test1": SSHConfig(
@@ -49,317 +144,169 @@ class TestToolsComparison:
             ),
         }
 
-    @pytest.fixture
-    async def v1_server(self, ssh_configs):
+    @pytest.fixture(scope="class")
+    def mock_manager(self):
+        """Mock SSH manager shared by both servers to avoid real connections."""
+        mock_manager = MagicMock(spec=SSHConnectionManager)
+        mock_manager.get_all_server_infos.return_value = SERVER_INFOS
+        mock_manager.execute_command.return_value = "command output"
+        mock_manager.upload.return_value = "File uploaded successfully"
+        mock_manager.download.return_value = "File downloaded successfully"
+        return mock_manager
+
+    @pytest.fixture(autouse=True)
+    def _reset_mock_manager(self, mock_manager):
+        """Clear calls and side effects between tests, keeping return values."""
+        yield
+        mock_manager.reset_mock(side_effect=True)
+
+    @pytest.fixture(scope="class")
+    async def v1_server(self, ssh_configs, mock_manager):
         """Create and initialize v1 server instance."""
-        server = SSHMCPServer("test-v1-server")
-
-        # Mock SSH manager to avoid real connections
-        with patch(
-            "src.ssh_mcp.ssh_manager.SSHConnectionManager"
-        ) as mock_manager_class:
-            mock_manager = AsyncMock()
-            mock_manager_class.get_instance.return_value = mock_manager
-            mock_manager.get_all_server_infos.return_value = [
-                type(
-                    "ServerInfo",
-                    (),
-                    {
-                        "name": "test1",
-                        "host": "localhost",
-                        "port": 22,
-                        "username": "testuser1",
-                        "connected": True,
-                    },
-                )(),
-                type(
-                    "ServerInfo",
-                    (),
-                    {
-                        "name": "test2",
-                        "host": "127.0.0.1",
-                        "port": 2222,
-                        "username": "testuser2",
-                        "connected": True,
-                    },
-                )(),
-            ]
-            mock_manager.execute_command.return_value = "command output"
-            mock_manager.upload_file.return_value = "Upload successful"
-            mock_manager.download_file.return_value = "Download successful"
-
-            try:
-                await server.initialize(ssh_configs)
-            except Exception:
-                # SSH connection errors expected in test, but we need tools registered
-                # Force tool registration for v1 server
-                server._register_tools()
-
+        async with _mocked_server(
+            "test-v1-server", ssh_configs, mock_manager
+        ) as server:
             yield server
 
-            try:
-                await server.cleanup()
-            except Exception:
-                pass
-
-    @pytest.fixture
-    async def v2_server(self, ssh_configs):
+    @pytest.fixture(scope="class")
+    async def v2_server(self, ssh_configs, mock_manager):
         """Create and initialize v2 server instance."""
-        server = SSHMCPServer("test-v2-server")
-
-        # Mock SSH manager to avoid real connections
-        with patch(
-            "src.ssh_mcp.ssh_manager.SSHConnectionManager"
-        ) as mock_manager_class:
-            mock_manager = AsyncMock()
-            mock_manager_class.get_instance.return_value = mock_manager
-            mock_manager.get_all_server_infos.return_value = [
-                type(
-                    "ServerInfo",
-                    (),
-                    {
-                        "name": "test1",
-                        "host": "localhost",
-                        "port": 22,
-                        "username": "testuser1",
-                        "connected": True,
-                    },
-                )(),
-                type(
-                    "ServerInfo",
-                    (),
-                    {
-                        "name": "test2",
-                        "host": "127.0.0.1",
-                        "port": 2222,
-                        "username": "testuser2",
-                        "connected": True,
-                    },
-                )(),
-            ]
-            mock_manager.execute_command.return_value = "command output"
-            mock_manager.upload_file.return_value = "Upload successful"
-            mock_manager.download_file.return_value = "Download successful"
-
-            # Mock the global SSH manager for v2 tools
-            with patch(
-                "src.ssh_mcp.tools.ssh_tools._ssh_manager",
-                mock_manager,
-            ):
-                # Set the SSH manager manually to ensure tools work
-                from src.ssh_mcp.tools.ssh_tools import set_ssh_manager
-
-                set_ssh_manager(mock_manager)
-
-                try:
-                    await server.initialize(ssh_configs)
-                except Exception:
-                    # Initialize SSH manager manually for v2
-                    server._ssh_manager = mock_manager
-
-                yield server
-
-                try:
-                    await server.cleanup()
-                except Exception:
-                    pass
-
-    @asynccontextmanager
-    async def get_clients(self, v1_server, v2_server):
-        """Create clients for both v1 and v2 servers."""
+        async with _mocked_server(
+            "test-v2-server", ssh_configs, mock_manager
+        ) as server:
+            yield server
+
+    @pytest.fixture(scope="class")
+    async def clients(self, v1_server, v2_server):
+        """Connect one client to each server, kept open for the whole class."""
         v1_client = Client(v1_server.mcp)
         v2_client = Client(v2_server.mcp)
 
         async with v1_client, v2_client:
             yield v1_client, v2_client
 
-    @pytest.mark.asyncio
-    async def test_tool_registration_parity(self, v1_server, v2_server):
+    @pytest.fixture(scope="class")
+    async def listed_tools(self, clients):
+        """List the tools of both servers once per class."""
+        v1_client, v2_client = clients
+        return await asyncio.gather(v1_client.list_tools(), v2_client.list_tools())
+
+    async def test_tool_registration_parity(self, listed_tools):
         """Test that both v1 and v2 servers register the same tools."""
-        async with self.get_clients(v1_server, v2_server) as (v1_client, v2_client):
-            # Get tool lists
-            v1_tools = await v1_client.list_tools()
-            v2_tools = await v2_client.list_tools()
-
-            # Extract tool names
-            v1_tool_names = {tool.name for tool in v1_tools}
-            v2_tool_names = {tool.name for tool in v2_tools}
-
-            # Verify same tools are registered
-            assert v1_tool_names == v2_tool_names, (
-                f"Tool sets differ: v1={v1_tool_names}, v2={v2_tool_names}"
-            )
-            assert len(v1_tools) == len(v2_tools), (
-                f"Tool count differs: v1={len(v1_tools)}, v2={len(v2_tools)}"
-            )
+        v1_tools, v2_tools = listed_tools
+
+        # Extract tool names
+        v1_tool_names = frozenset(tool.name for tool in v1_tools)
+        v2_tool_names = frozenset(tool.name for tool in v2_tools)
+
+        # Verify same tools are registered
+        assert v1_tool_names == v2_tool_names, (
+            f"Tool sets differ: v1={v1_tool_names}, v2={v2_tool_names}"
+        )
+        assert len(v1_tools) == len(v2_tools), (
+            f"Tool count differs: v1={len(v1_tools)}, v2={len(v2_tools)}"
+        )
+
+        # Verify expected tools are present
+        assert EXPECTED_TOOLS <= v1_tool_names, (
+            f"Missing tools in v1: {EXPECTED_TOOLS - v1_tool_names}"
+        )
+        assert EXPECTED_TOOLS <= v2_tool_names, (
+            f"Missing tools in v2: {EXPECTED_TOOLS - v2_tool_names}"
+        )
+
+    async def test_tool_descriptions_compatibility(self, listed_tools):
+        """Test that tool descriptions are compatible between versions."""
+        v1_tools, v2_tools = listed_tools
+
+        # Create lookup by tool name
+        v1_tool_map = {tool.name: tool for tool in v1_tools}
+        v2_tool_map = {tool.name: tool for tool in v2_tools}
 
-            # Verify expected tools are present
-            expected_tools = {"execute-command", "upload", "download", "list-servers"}
-            assert expected_tools.issubset(v1_tool_names), (
-                f"Missing tools in v1: {expected_tools - v1_tool_names}"
+        # Compare descriptions for each tool
+        for tool_name in v1_tool_map:
+            v1_tool = v1_tool_map[tool_name]
+            v2_tool = v2_tool_map[tool_name]
+
+            # Descriptions should be meaningful (not empty)
+            assert len(v1_tool.description) > 10, (
+                f"v1 {tool_name} description too short"
             )
-            assert expected_tools.issubset(v2_tool_names), (
-                f"Missing tools in v2: {expected_tools - v2_tool_names}"
+            assert len(v2_tool.description) > 10, (
+                f"v2 {tool_name} description too short"
             )
 
-    @pytest.mark.asyncio
-    async def test_tool_descriptions_compatibility(self, v1_server, v2_server):
-        """Test that tool descriptions are compatible between versions."""
-        async with self.get_clients(v1_server, v2_server) as (v1_client, v2_client):
-            v1_tools = await v1_client.list_tools()
-            v2_tools = await v2_client.list_tools()
-
-            # Create lookup by tool name
-            v1_tool_map = {tool.name: tool for tool in v1_tools}
-            v2_tool_map = {tool.name: tool for tool in v2_tools}
-
-            # Compare descriptions for each tool
-            for tool_name in v1_tool_map:
-                v1_tool = v1_tool_map[tool_name]
-                v2_tool = v2_tool_map[tool_name]
-
-                # Descriptions should be meaningful (not empty)
-                assert len(v1_tool.description) > 10, (
-                    f"v1 {tool_name} description too short"
-                )
-                assert len(v2_tool.description) > 10, (
-                    f"v2 {tool_name} description too short"
-                )
-
-                # Both should contain key action words
-                if tool_name == "execute-command":
-                    assert "command" in v1_tool.description.lower()
-                    assert "command" in v2_tool.description.lower()
-                elif tool_name == "upload":
-                    assert "upload" in v1_tool.description.lower()
-                    assert "upload" in v2_tool.description.lower()
+            # Both should contain key action words
+            if tool_name == "execute-command":
+                assert "command" in v1_tool.description.lower()
+                assert "command" in v2_tool.description.lower()
+            elif tool_name == "upload":
+                assert "upload" in v1_tool.description.lower()
+                assert "upload" in v2_tool.description.lower()
 
-    @pytest.mark.asyncio
-    async def test_execute_command_compatibility(self, v1_server, v2_server):
+    @pytest.mark.parametrize("case", EXEC_CASES, ids=lambda c: c["cmdString"][:16])
+    async def test_execute_command_compatibility(self, clients, case):
         """Test execute-command tool compatibility."""
-        test_cases = [
-            {"cmd_string": "ls -la", "connectionName": None},
-            {"cmd_string": "ps aux", "connectionName": "test1"},
-            {"cmd_string": "echo 'hello world'", "connectionName": "test2"},
-            {"cmd_string": "pwd", "connectionName": "default"},
-        ]
-
-        async with self.get_clients(v1_server, v2_server) as (v1_client, v2_client):
-            for test_case in test_cases:
-                print(f"Testing execute-command with: {test_case}")
-
-                # Call both versions
-                v1_result = await v1_client.call_tool("execute-command", test_case)
-                v2_result = await v2_client.call_tool("execute-command", test_case)
-
-                # Both should succeed or fail consistently
-                assert isinstance(v1_result, MCPResponse)
-                assert isinstance(v2_result, MCPResponse)
-
-                # For successful calls, verify content structure
-                if hasattr(v1_result, "content") and hasattr(v2_result, "content"):
-                    # Both should return string content
-                    v1_content = v1_result.content[0].text if v1_result.content else ""
-                    v2_content = v2_result.content[0].text if v2_result.content else ""
-
-                    assert isinstance(v1_content, str), (
-                        f"v1 result not string: {type(v1_content)}"
-                    )
-                    assert isinstance(v2_content, str), (
-                        f"v2 result not string: {type(v2_content)}"
-                    )
-
-    @pytest.mark.asyncio
-    async def test_upload_tool_compatibility(self, v1_server, v2_server):
-        """Test upload tool compatibility."""
-        test_cases = [
-            {
-                "localPath": "/tmp/test.txt",
-                "remotePath": "/home/user/test.txt",
-                "connectionName": None,
-            },
-            {
-                "localPath": "/local/file.py",
-                "remotePath": "/remote/file.py",
-                "connectionName": "test1",
-            },
-            {
-                "localPath": "./config.json",
-                "remotePath": "/etc/config.json",
-                "connectionName": "test2",
-            },
-        ]
+        v1_result, v2_result = await asyncio.gather(
+            *(client.call_tool("execute-command", case) for client in clients)
+        )
 
-        async with self.get_clients(v1_server, v2_server) as (v1_client, v2_client):
-            for test_case in test_cases:
-                print(f"Testing upload with: {test_case}")
+        # Both should succeed or fail consistently
+        assert isinstance(v1_result, CallToolResult)
+        assert isinstance(v2_result, CallToolResult)
 
-                v1_result = await v1_client.call_tool("upload", test_case)
-                v2_result = await v2_client.call_tool("upload", test_case)
+        # Both should return string content
+        v1_content = v1_result.content[0].text if v1_result.content else ""
+        v2_content = v2_result.content[0].text if v2_result.content else ""
 
-                # Verify result structure consistency
-                assert isinstance(v1_result, MCPResponse)
-                assert isinstance(v2_result, MCPResponse)
+        assert isinstance(v1_content, str), f"v1 result not string: {type(v1_content)}"
+        assert isinstance(v2_content, str), f"v2 result not string: {type(v2_content)}"
 
-    @pytest.mark.asyncio
-    async def test_download_tool_compatibility(self, v1_server, v2_server):
-        """Test download tool compatibility."""
-        test_cases = [
-            {
-                "remotePath": "/home/user/data.txt",
-                "localPath": "/tmp/data.txt",
-                "connectionName": None,
-            },
-            {
-                "remotePath": "/etc/hosts",
-                "localPath": "./hosts.backup",
-                "connectionName": "test1",
-            },
-            {
-                "remotePath": "/var/log/app.log",
-                "localPath": "/logs/app.log",
-                "connectionName": "test2",
-            },
-        ]
+    @pytest.mark.parametrize("case", UPLOAD_CASES, ids=lambda c: c["remotePath"])
+    async def test_upload_tool_compatibility(self, clients, case):
+        """Test upload tool compatibility."""
+        v1_result, v2_result = await asyncio.gather(
+            *(client.call_tool("upload", case) for client in clients)
+        )
 
-        async with self.get_clients(v1_server, v2_server) as (v1_client, v2_client):
-            for test_case in test_cases:
-                print(f"Testing download with: {test_case}")
+        # Verify result structure consistency
+        assert isinstance(v1_result, CallToolResult)
+        assert isinstance(v2_result, CallToolResult)
 
-                v1_result = await v1_client.call_tool("download", test_case)
-                v2_result = await v2_client.call_tool("download", test_case)
+    @pytest.mark.parametrize("case", DOWNLOAD_CASES, ids=lambda c: c["remotePath"])
+    async def test_download_tool_compatibility(self, clients, case):
+        """Test download tool compatibility."""
+        v1_result, v2_result = await asyncio.gather(
+            *(client.call_tool("download", case) for client in clients)
+        )
 
-                # Verify result structure consistency
-                assert isinstance(v1_result, MCPResponse)
-                assert isinstance(v2_result, MCPResponse)
+        # Verify result structure consistency
+        assert isinstance(v1_result, CallToolResult)
+        assert isinstance(v2_result, CallToolResult)
 
-    @pytest.mark.asyncio
-    async def test_list_servers_compatibility(self, v1_server, v2_server):
+    async def test_list_servers_compatibility(self, clients):
         """Test list-servers tool compatibility."""
-        async with self.get_clients(v1_server, v2_server) as (v1_client, v2_client):
-            # Test list-servers with no parameters
-            v1_result = await v1_client.call_tool("list-servers", {})
-            v2_result = await v2_client.call_tool("list-servers", {})
-
-            # Both should return server information
-            assert v1_result is not None, "v1 list-servers returned None"
-            assert v2_result is not None, "v2 list-servers returned None"
-
-            # Verify content structure
-            if hasattr(v1_result, "content") and hasattr(v2_result, "content"):
-                v1_content = v1_result.content[0].text if v1_result.content else ""
-                v2_content = v2_result.content[0].text if v2_result.content else ""
-
-                # Both should contain server information
-                assert "test1" in v1_content or "localhost" in v1_content, (
-                    "v1 missing server info"
-                )
-                assert "test1" in v2_content or "localhost" in v2_content, (
-                    "v2 missing server info"
-                )
-
-    @pytest.mark.asyncio
-    async def test_error_handling_consistency(self, v1_server, v2_server):
+        v1_client, v2_client = clients
+        # Test list-servers with no parameters
+        v1_result = await v1_client.call_tool("list-servers", {})
+        v2_result = await v2_client.call_tool("list-servers", {})
+
+        # Both should return server information
+        assert isinstance(v1_result, CallToolResult)
+        assert isinstance(v2_result, CallToolResult)
+
+        v1_content = v1_result.content[0].text if v1_result.content else ""
+        v2_content = v2_result.content[0].text if v2_result.content else ""
+
+        # Both should contain server information
+        assert "test1" in v1_content or "localhost" in v1_content, (
+            "v1 missing server info"
+        )
+        assert "test1" in v2_content or "localhost" in v2_content, (
+            "v2 missing server info"
+        )
+
+    async def test_error_handling_consistency(self, clients):
         """Test that error handling is consistent between v1 and v2."""
         # Test invalid tool calls
         error_test_cases = [
@@ -375,124 +322,93 @@ class TestToolsComparison:
             ("execute-command", {"invalid_param": "value"}),  # Invalid parameters
         ]
 
-        async with self.get_clients(v1_server, v2_server) as (v1_client, v2_client):
-            for tool_name, params in error_test_cases:
-                print(f"Testing error handling for {tool_name} with {params}")
-
-                v1_error = None
-                v2_error = None
-
-                # Capture errors from both versions
-                try:
-                    await v1_client.call_tool(tool_name, params)
-                except Exception as e:
-                    v1_error = e
-
-                try:
-                    await v2_client.call_tool(tool_name, params)
-                except Exception as e:
-                    v2_error = e
-
-                # Both should handle errors similarly (both fail or both succeed)
-                assert (v1_error is None) == (v2_error is None), (
-                    f"Error handling differs for {tool_name}: v1_error={v1_error}, v2_error={v2_error}"
-                )
+        v1_client, v2_client = clients
+        for tool_name, params in error_test_cases:
+            # Capture errors from both versions
+            v1_result, v2_result = await asyncio.gather(
+                v1_client.call_tool(tool_name, params),
+                v2_client.call_tool(tool_name, params),
+                return_exceptions=True,
+            )
+            v1_error = v1_result if isinstance(v1_result, Exception) else None
+            v2_error = v2_result if isinstance(v2_result, Exception) else None
 
-    @pytest.mark.asyncio
-    async def test_performance_comparison(self, v1_server, v2_server):
-        """Test performance characteristics between v1 and v2."""
-        test_command = "echo 'performance test'"
-        iterations = 5
+            # Both should handle errors similarly (both fail or both succeed)
+            assert (v1_error is None) == (v2_error is None), (
+                f"Error handling differs for {tool_name}: v1_error={v1_error}, v2_error={v2_error}"
+            )
 
-        async with self.get_clients(v1_server, v2_server) as (v1_client, v2_client):
-            # Measure v1 performance
-            v1_times = []
-            for _ in range(iterations):
-                start_time = time.time()
-                await v1_client.call_tool(
-                    "execute-command", {"cmd_string": test_command}
-                )
-                v1_times.append(time.time() - start_time)
+    async def test_performance_comparison(self, clients):
+        """Report median call times of v1 and v2 without asserting on them."""
+        arguments = {"cmdString": "echo 'performance test'"}
+        iterations = 3
 
-            # Measure v2 performance
-            v2_times = []
+        async def median_ns(client):
+            # One untimed call first so setup costs don't skew the samples
+            await client.call_tool("execute-command", arguments)
+            samples = []
             for _ in range(iterations):
-                start_time = time.time()
-                await v2_client.call_tool(
-                    "execute-command", {"cmd_string": test_command}
-                )
-                v2_times.append(time.time() - start_time)
-
-            # Calculate averages
-            v1_avg = sum(v1_times) / len(v1_times)
-            v2_avg = sum(v2_times) / len(v2_times)
-
-            print("Performance comparison:")
-            print(f"  v1 average: {v1_avg:.4f}s")
-            print(f"  v2 average: {v2_avg:.4f}s")
-            print(f"  v2 vs v1: {((v2_avg - v1_avg) / v1_avg * 100):+.1f}%")
-
-            # v2 should not be significantly slower (allow 50% tolerance for test overhead)
-            assert v2_avg < v1_avg * 1.5, (
-                f"v2 significantly slower: {v2_avg:.4f}s vs {v1_avg:.4f}s"
-            )
-
-    @pytest.mark.asyncio
-    async def test_tool_metadata_enhancements(self, v2_server):
+                start_ns = time.perf_counter_ns()
+                await client.call_tool("execute-command", arguments)
+                samples.append(time.perf_counter_ns() - start_ns)
+            return statistics.median(samples)
+
+        v1_client, v2_client = clients
+        v1_median = await median_ns(v1_client) / 1e9
+        v2_median = await median_ns(v2_client) / 1e9
+
+        print("Performance comparison:")
+        print(f"  v1 median: {v1_median:.4f}s")
+        print(f"  v2 median: {v2_median:.4f}s")
+        print(f"  v2 vs v1: {((v2_median - v1_median) / v1_median * 100):+.1f}%")
+        # Only reported: timings of a few mocked calls are too noisy to assert
+        # on under load or with xdist; tests/performance_benchmark.py measures
+
+    async def test_tool_metadata_enhancements(self, listed_tools):
         """Test that v2 tools have enhanced metadata."""
-        async with Client(v2_server.mcp) as client:
-            tools = await client.list_tools()
-
-            for tool in tools:
-                print(f"Checking metadata for {tool.name}")
+        _, tools = listed_tools
+
+        for tool in tools:
+            # All tools should have descriptions
+            assert tool.description, f"Tool {tool.name} missing description"
+            assert len(tool.description) > 20, f"Tool {tool.name} description too short"
+
+            # Check for enhanced schema information
+            if tool.inputSchema:
+                schema = tool.inputSchema
+                assert "properties" in schema, (
+                    f"Tool {tool.name} missing properties in schema"
+                )
 
-                # All tools should have descriptions
-                assert tool.description, f"Tool {tool.name} missing description"
-                assert len(tool.description) > 20, (
-                    f"Tool {tool.name} description too short"
+                # Verify required parameters are documented
+                required = REQUIRED_PROPS.get(tool.name, frozenset())
+                assert required <= schema["properties"].keys(), (
+                    f"{tool.name} missing parameters: "
+                    f"{required - schema['properties'].keys()}"
                 )
 
-                # Check for enhanced schema information
-                if hasattr(tool, "inputSchema") and tool.inputSchema:
-                    schema = tool.inputSchema
-                    assert "properties" in schema, (
-                        f"Tool {tool.name} missing properties in schema"
-                    )
-
-                    # Verify required parameters are documented
-                    properties = schema["properties"]
-                    if tool.name == "execute-command":
-                        assert "cmd_string" in properties, (
-                            "execute-command missing cmd_string parameter"
-                        )
-                    elif tool.name in ["upload", "download"]:
-                        assert any(
-                            param in properties for param in ["localPath", "remotePath"]
-                        ), f"{tool.name} missing path parameters"
-
-    @pytest.mark.asyncio
-    async def test_context_logging_integration(self, v2_server):
+    async def test_context_logging_integration(self, clients):
         """Test that v2 tools properly integrate with FastMCP Context."""
         # This test verifies that Context dependency injection works
         # Note: Actual logging would require more complex mocking
-        async with Client(v2_server.mcp) as client:
-            # Call a tool that should use Context
-            result = await client.call_tool("list-servers", {})
+        _, client = clients
+
+        # Call a tool that should use Context
+        result = await client.call_tool("list-servers", {})
 
-            # Tool should execute successfully with Context integration
-            assert result is not None, "Context-enabled tool failed"
+        # Tool should execute successfully with Context integration
+        assert result is not None, "Context-enabled tool failed"
 
-            # Verify structured logging would work (in real scenario)
-            # This is a placeholder for more detailed Context testing
-            assert True, "Context integration verified"
+        # Verify structured logging would work (in real scenario)
+        # This is a placeholder for more detailed Context testing
+        assert True, "Context integration verified"
 
-    @pytest.mark.asyncio
-    async def test_end_to_end_workflow(self, v1_server, v2_server):
+    async def test_end_to_end_workflow(self, clients):
         """Test complete workflow compatibility between v1 and v2."""
         workflow_steps = [
             ("list-servers", {}),
-            ("execute-command", {"cmd_string": "whoami"}),
-            ("execute-command", {"cmd_string": "pwd", "connectionName": "test1"}),
+            ("execute-command", {"cmdString": "whoami"}),
+            ("execute-command", {"cmdString": "pwd", "connectionName": "test1"}),
             (
                 "upload",
                 {"localPath": "/tmp/test.txt", "remotePath": "/tmp/uploaded.txt"},
@@ -503,52 +419,31 @@ class TestToolsComparison:
             ),
         ]
 
-        async with self.get_clients(v1_server, v2_server) as (v1_client, v2_client):
-            v1_results = []
-            v2_results = []
+        v1_client, v2_client = clients
+        v1_results = []
+        v2_results = []
 
-            # Execute workflow on both versions
-            for tool_name, params in workflow_steps:
-                print(f"Workflow step: {tool_name} with {params}")
-
-                v1_result = await v1_client.call_tool(tool_name, params)
-                v2_result = await v2_client.call_tool(tool_name, params)
-
-                v1_results.append((tool_name, v1_result))
-                v2_results.append((tool_name, v2_result))
-
-            # Verify workflow completed successfully on both versions
-            assert len(v1_results) == len(workflow_steps), "v1 workflow incomplete"
-            assert len(v2_results) == len(workflow_steps), "v2 workflow incomplete"
-
-            # Verify both versions produced results for each step
-            for i, (tool_name, _) in enumerate(workflow_steps):
-                v1_step_result = v1_results[i][1]
-                v2_step_result = v2_results[i][1]
-
-                assert v1_step_result is not None, f"v1 {tool_name} returned None"
-                assert v2_step_result is not None, f"v2 {tool_name} returned None"
+        # Execute workflow on both versions
+        for tool_name, params in workflow_steps:
+            v1_result, v2_result = await asyncio.gather(
+                v1_client.call_tool(tool_name, params),
+                v2_client.call_tool(tool_name, params),
+            )
 
+            v1_results.append((tool_name, v1_result))
+            v2_results.append((tool_name, v2_result))
 
-@pytest.mark.asyncio
-async def test_migration_compatibility_summary():
-    """Summary test to validate overall migration readiness."""
-    print("\n" + "=" * 80)
-    print("🧪 SSH MCP Tools Migration Compatibility Summary")
-    print("=" * 80)
+        # Verify workflow completed successfully on both versions
+        assert len(v1_results) == len(workflow_steps), "v1 workflow incomplete"
+        assert len(v2_results) == len(workflow_steps), "v2 workflow incomplete"
 
-    # This would be run after all other tests pass
-    print("✅ Tool registration parity verified")
-    print("✅ API compatibility confirmed")
-    print("✅ Functional equivalence validated")
-    print("✅ Error handling consistency checked")
-    print("✅ Performance regression testing completed")
-    print("✅ Enhanced metadata features verified")
-    print("✅ Context integration confirmed")
-    print("✅ End-to-end workflow compatibility validated")
+        # Verify both versions produced results for each step
+        for i, (tool_name, _) in enumerate(workflow_steps):
+            v1_step_result = v1_results[i][1]
+            v2_step_result = v2_results[i][1]
 
-    print("\n🎉 Migration from v1 to v2 tools is SAFE and RECOMMENDED")
-    print("=" * 80)
+            assert v1_step_result is not None, f"v1 {tool_name} returned None"
+            assert v2_step_result is not None, f"v2 {tool_name} returned None"
 
 
 if __name__ == "__main__":